@@ -1,16 +1,22 @@
 import os
 import sys
 import json
-import pickle
 import pygame
 import threading
 import subprocess
 from pathlib import Path
 from assets.save import Save
+from assets import logic_file
+from assets.autosave import AutoSave
+from assets.definitions import add_netlist_cache, remove_netlist_cache, get_definitions
+from assets.netlist_cache import NetlistCache, NetlistLibrary, NETLIST_CACHE_SUFFIX, write_netlist_cache
 from assets.modules import set_color
+from assets.fonts import get_font, render_text
+from assets.input_state import input_state
 from assets.widgets import MenuBar, ListView, Button
+from assets.logic_gates_components import Circuit
 from assets.logic_circuits_display import CircuitDisplay
-from assets.settings import SCR_WIDTH, SCR_HEIGHT, FPS, APP_NAME
+from assets.settings import SCR_WIDTH, SCR_HEIGHT, FPS, IDLE_FRAME_THRESHOLD, APP_NAME, AUTOSAVE_INTERVAL, AUTOSAVE_STATUS_TIME, DEFINITION_LIBRARY_PATH, DEFINITION_LIBRARY_MAX_SIZE
 
 class App:
     def __init__(self, file_path: str | None, new_file: bool) -> None:
@@ -26,7 +32,7 @@ class App:
         
         self.mainpy_file_path = [path.as_posix() for path in list(Path(os.getcwd()).glob('*.py'))][0]
         
-        self.font = pygame.font.SysFont('Consolas', 20)
+        self.font = get_font('Consolas', 20)
         
         with open('assets/themes.json') as file:
             self.bg_colors = json.loads(file.read())
@@ -35,9 +41,18 @@ class App:
         self.BG_COLOR_tracker = self.bg_colors["0"]
         
         self.save = Save(self.file_path, {}, self._open_new, ['IFEs Logical File', '*.logic'], self._save_func)
+        self.autosave = AutoSave(self._write_project, AUTOSAVE_INTERVAL, AUTOSAVE_STATUS_TIME)
+        self.netlist_cache = None
+        self.netlist_cache_path = None
+        self.netlist_cache_keys = set()
+        self.netlist_library = NetlistLibrary(DEFINITION_LIBRARY_PATH, DEFINITION_LIBRARY_MAX_SIZE)
+        add_netlist_cache(self.netlist_library)
         
         self.reset_it = False
         
+        self.quiet_frames = 0
+        self.frame_state = None
+        
         self.button_colors = '#777777'
         self.button_text_colors = 'white'
         self.border_radius = 10
@@ -71,9 +86,9 @@ class App:
         
         self.menubar = MenuBar(self.screen, 0, 40, 20, 100, 25, 'grey15', 'grey15', 'lightblue', 'white', 'grey15', 2, 2, 2, menu_bar_options, dropdown_font_family='System')
         
-        self.detailed_font = pygame.font.SysFont('Arial', 500)
-        self.add_node_font = pygame.font.SysFont('Arial', 45)
-        self.edit_button_font = pygame.font.SysFont('Sans Serif', 20)
+        self.detailed_font = get_font('Arial', 500)
+        self.add_node_font = get_font('Arial', 45)
+        self.edit_button_font = get_font('Sans Serif', 20)
         
         self.delete_circuit_button = Button(self.screen, (0, 0), (10, 10), 'red', image=self.detailed_font.render('x', True, 'white'), on_left_mouse_button_clicked=self.circuit_displayer._remove_cicuit, border_radius=0, scale_img=True)
         
@@ -100,7 +115,7 @@ class App:
                                     app_control_widget_y_border_offset,
                                     app_control_options,
                                     'horizontal',
-                                    font=pygame.font.SysFont('Cambria', int(app_control_widget_height / 2)))
+                                    font=get_font('Cambria', int(app_control_widget_height / 2)))
         
         self.delete_circuit_button.set_pos(bottomright=self.app_control.bg_rect.topright)
         self.prev_circuit_button.set_pos(midright=(self.app_control.bg_rect.left, self.app_control.bg_rect.centery))
@@ -129,15 +144,91 @@ class App:
     
     def _init_circuit_displayer(self, new_file: str):
         self.circuit_displayer = CircuitDisplay(self.screen, len(self.bg_colors), self.add_buttons_border_offset, self.add_buttons_size, 40)
+        self.saved_version = None
+        self.journal = None
+        self.saved_circuits = []
+        self.saved_project_state = None
+        self.autosave_enabled = True
+        if self.netlist_cache is not None:
+            remove_netlist_cache(self.netlist_cache)
+            self.netlist_cache = None
         if self.file_path is not None and not new_file:
-            with open(self.file_path, 'rb') as file_path:
-                value = pickle.load(file_path)
-                self.file_path = self.save.file_path
-                self.circuit_displayer.set_dict(value)
+            self.netlist_cache = NetlistCache(self.save.file_path + NETLIST_CACHE_SUFFIX)
+            self.netlist_cache_path = self.netlist_cache.file_path
+            self.netlist_cache_keys = set(self.netlist_cache.entries)
+            add_netlist_cache(self.netlist_cache)
+            
+            value, self.journal = logic_file.load_project(self.save.file_path, lazy=True)
+            self.autosave_enabled = self.journal is not None
+            self.file_path = self.save.file_path
+            self.circuit_displayer.set_dict(value)
+            self._set_saved_state()
+    
+    def _get_project_state(self):
+        return self.circuit_displayer.theme_color, self.circuit_displayer.circuit_index, [(id(gate), gate.version) for gate in self.circuit_displayer.gate_options]
+    
+    def _get_saved_state(self):
+        return self.circuit_displayer.version, [(circuit, circuit.version if isinstance(circuit, Circuit) else None) for circuit in self.circuit_displayer.circuit_editors], self._get_project_state()
+    
+    def _set_saved_state(self, saved_state=None):
+        self.saved_version, self.saved_circuits, self.saved_project_state = saved_state if saved_state is not None else self._get_saved_state()
+    
+    def _write_project(self, snapshot, file_path):
+        info, netlists = snapshot
+        journal = logic_file.save_project(info, file_path)
+        if netlists is not None:
+            write_netlist_cache(file_path + NETLIST_CACHE_SUFFIX, netlists)
+            self.netlist_library.store(netlists)
+        return journal
+    
+    def _write_journal(self, records, file_path):
+        for append_func, args in records:
+            append_func(*args)
     
     def _save_func(self, info, file_path):
-        pickle.dump(info, open(file_path, 'wb'))
+        saved_state = self._get_saved_state()
+        netlists = {key: definition.netlist for key, definition in get_definitions().items()}
+        if file_path + NETLIST_CACHE_SUFFIX == self.netlist_cache_path and netlists.keys() <= self.netlist_cache_keys:
+            netlists = None
+        else:
+            self.netlist_cache_path = file_path + NETLIST_CACHE_SUFFIX
+            self.netlist_cache_keys = set(netlists)
+        
+        def on_saved(journal):
+            self.journal = journal
+            self.file_path = file_path
+            self._set_saved_state(saved_state)
+            self.autosave_enabled = True
+            self.reset_it = False
+        
+        self.journal = None
+        self.autosave.save((info, netlists), file_path, on_saved)
+    
+    def _save_journal(self):
+        circuit_editors = self.circuit_displayer.circuit_editors
+        circuit_sources = [next((index for index, (saved_circuit, _) in enumerate(self.saved_circuits) if saved_circuit is circuit), -1) for circuit in circuit_editors]
+        
+        journal = self.journal
+        records = []
+        if circuit_sources != list(range(len(self.saved_circuits))) or self._get_project_state() != self.saved_project_state:
+            new_circuits = [self.circuit_displayer._get_circuit_info(circuit) for circuit, source in zip(circuit_editors, circuit_sources) if source == -1]
+            records.append((journal.append_project, (self.circuit_displayer.get_project_dict(), circuit_sources, new_circuits)))
+        
+        for index, (circuit, source) in enumerate(zip(circuit_editors, circuit_sources)):
+            if source != -1 and isinstance(circuit, Circuit) and circuit.version != self.saved_circuits[source][1]:
+                records.append((journal.append_circuit, (index, self.circuit_displayer._get_circuit_info(circuit))))
+        
+        def on_failed(error):
+            if self.journal is journal:
+                self.journal = None
+            self.saved_version = None
+        
+        if records:
+            self.autosave.save(records, journal.file_path, write_func=self._write_journal, on_failed_func=on_failed)
+        
         self.file_path = self.save.file_path
+        self.reset_it = False
+        self._set_saved_state()
     
     def _open_new(self, file_path, new_file):
         subprocess_thread = threading.Thread(target=lambda: subprocess.run(['py', self.mainpy_file_path, file_path, str(int(new_file))]))
@@ -163,22 +254,30 @@ class App:
         self.reset_it = False
     
     def _save(self):
-        self._on_save()
-        self.save.save()
+        if self.journal is not None and self.journal.file_path == self.save.file_path and not self.journal.needs_compaction():
+            self._save_journal()
+        else:
+            self._on_save()
+            self.save.save()
     
     def _save_as(self):
         self._on_save()
         self.save.save_as()
     
     def _quit(self):
+        self.autosave.wait()
         pygame.quit()
         sys.exit()
     
     def _app_loop(self):
-        self.fps_surf = self.font.render(f'FPS: {round(self.clock.get_fps())}', False, 'white')
+        self.fps_surf = render_text(self.font, f'FPS: {round(self.clock.get_fps())}', False, 'white')
         self.fps_rect = self.fps_surf.get_rect(bottomright=(SCR_WIDTH - 20, SCR_HEIGHT))
         self.screen.blit(self.fps_surf, self.fps_rect)
         
+        if self.autosave.status != 'idle':
+            status_surf = render_text(self.font, {'saving': 'Saving...', 'saved': 'Saved', 'failed': 'Save failed'}[self.autosave.status], False, 'white')
+            self.screen.blit(status_surf, status_surf.get_rect(bottomright=(self.fps_rect.left - 20, SCR_HEIGHT)))
+        
         self.circuit_displayer.update(self.events, self.BG_COLOR)
         self.app_control.buttons[-1].configure(disabled=self.circuit_displayer.edit_index is None)
         
@@ -194,36 +293,59 @@ class App:
         self.menubar.update()
         self.app_control.update()
     
+    def _get_frame_state(self):
+        return self.circuit_displayer.version, self.circuit_displayer.circuit_index, self.BG_COLOR, self.autosave.status, self.reset_it, self.circuit_displayer.get_animation_phase()
+    
+    def _is_quiet_frame(self):
+        frame_state = self._get_frame_state()
+        is_quiet = not self.events and not any(input_state.pressed) and frame_state == self.frame_state and self.circuit_displayer.is_settled()
+        self.frame_state = frame_state
+        return is_quiet
+    
     def _event_loop(self, event):
         self.keys = pygame.key.get_pressed()
         
         if event.type == pygame.QUIT:
             self._quit()
     
+    def _run_frame(self):
+        self.keys = pygame.key.get_pressed()
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.delta_time = self.clock.tick(FPS)
+        
+        self.BG_COLOR_tracker = self.bg_colors[str(self.circuit_displayer.circuit_index)]
+        
+        if self.BG_COLOR != self.BG_COLOR_tracker:
+            self.BG_COLOR = self.BG_COLOR_tracker
+        
+        self.autosave.update()
+        
+        if self.save.file_path is not None:
+            if self.circuit_displayer.version != self.saved_version and self.autosave_enabled and self.autosave.is_due():
+                self._on_save()
+                self._save_func(self.save.save_info, self.save.file_path)
+            
+            if self.circuit_displayer.version != self.saved_version:
+                if not self.reset_it:
+                    pygame.display.set_caption(f'{APP_NAME} - {self._file_path} - *Unsaved')
+                    self.reset_it = True
+        
+        self.events = pygame.event.get()
+        input_state.update()
+        for event in self.events:
+            self._event_loop(event)
+        
+        # Widgets draw themselves inside update(), so there are no per-component damage rects to pass to display.update(); whole frames are skipped instead.
+        self.quiet_frames = self.quiet_frames + 1 if self._is_quiet_frame() else 0
+        if self.quiet_frames > IDLE_FRAME_THRESHOLD:
+            return
+        
+        self.screen.fill(self.BG_COLOR)
+        self._app_loop()
+        
+        pygame.display.update()
+    
     def run(self):
         while True:
-            self.keys = pygame.key.get_pressed()
-            self.mouse_pos = pygame.mouse.get_pos()
-            self.delta_time = self.clock.tick(FPS)
+            self._run_frame()
 
-            self.BG_COLOR_tracker = self.bg_colors[str(self.circuit_displayer.circuit_index)]
-            
-            if self.BG_COLOR != self.BG_COLOR_tracker:
-                self.BG_COLOR = self.BG_COLOR_tracker
-            
-            if self.save.file_path is not None:
-                if self.circuit_displayer.get_dict() != self.save.save_info:
-                    if not self.reset_it:
-                        pygame.display.set_caption(f'{APP_NAME} - {self._file_path} - *Unsaved')
-                        self.reset_it = True
-            
-            self.screen.fill(self.BG_COLOR)
-            
-            self.events = pygame.event.get()
-            for event in self.events:
-                self._event_loop(event)
-            
-            self._app_loop()
-
-            pygame.display.update()
-    
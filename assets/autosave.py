@@ -0,0 +1,68 @@
+import time
+import queue
+import threading
+from typing import Any, Callable
+
+class AutoSave:
+    def __init__(self, write_func: Callable[[Any, str], Any], interval: float, status_time: float) -> None:
+        self.write_func = write_func
+        self.interval = interval
+        self.status_time = status_time
+        
+        self.status = 'idle'
+        self.error = None
+        self.pending = 0
+        self.last_save_time = time.time()
+        self.status_time_tracker = 0
+        
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        
+        self.thread = threading.Thread(target=self._worker)
+        self.thread.daemon = True
+        self.thread.start()
+    
+    @property
+    def busy(self):
+        return self.pending > 0
+    
+    def is_due(self):
+        return not self.busy and time.time() - self.last_save_time >= self.interval
+    
+    def save(self, info: Any, file_path: str, on_saved_func: Callable[[Any], None] = None, write_func: Callable[[Any, str], Any] = None, on_failed_func: Callable[[Exception], None] = None):
+        self.pending += 1
+        self.status = 'saving'
+        self.last_save_time = time.time()
+        self._requests.put((info, file_path, write_func if write_func is not None else self.write_func, on_saved_func, on_failed_func))
+    
+    def _worker(self):
+        while True:
+            info, file_path, write_func, on_saved_func, on_failed_func = self._requests.get()
+            try:
+                self._results.put((write_func(info, file_path), None, on_saved_func, on_failed_func))
+            except Exception as e:
+                self._results.put((None, e, on_saved_func, on_failed_func))
+    
+    def update(self):
+        while not self._results.empty():
+            result, error, on_saved_func, on_failed_func = self._results.get()
+            self.pending -= 1
+            if error is not None:
+                self.status = 'failed'
+                self.error = error
+                if on_failed_func is not None:
+                    on_failed_func(error)
+            else:
+                if on_saved_func is not None:
+                    on_saved_func(result)
+                if not self.busy and self.status != 'failed':
+                    self.status = 'saved'
+                    self.status_time_tracker = time.time()
+        
+        if self.status == 'saved' and time.time() - self.status_time_tracker >= self.status_time:
+            self.status = 'idle'
+    
+    def wait(self):
+        while self.busy:
+            time.sleep(0.01)
+            self.update()
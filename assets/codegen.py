@@ -0,0 +1,50 @@
+import time
+import weakref
+from assets.netlist import Netlist, CONST_NET
+
+_compiled_functions = weakref.WeakKeyDictionary()
+
+def generate_source(netlist: Netlist, function_name: str = 'logic'):
+    if netlist.has_feedback:
+        return None
+    
+    lines = [f'def {function_name}(inputs):', f'    n{CONST_NET} = 0']
+    for index, net in enumerate(netlist.input_nets):
+        lines.append(f'    n{net} = 1 if inputs[{index}] else 0')
+    
+    for component in netlist.components:
+        index = component[0]
+        record = netlist.gates[index]
+        inputs = [f'n{net}' for net in record.inputs]
+        outputs = [f'n{net}' for net in record.outputs]
+        match record.kind:
+            case 'And':
+                lines.append(f'    {outputs[0]} = {inputs[0]} & {inputs[1]}')
+            case 'Not':
+                lines.append(f'    {outputs[0]} = {inputs[0]} ^ 1')
+            case 'Or':
+                lines.append(f'    {outputs[0]} = {" | ".join(inputs)}')
+            case 'Timer':
+                lines.append(f'    {outputs[0]} = int(clock()) % 2')
+            case 'Custom' if outputs:
+                lines.append(f'    {", ".join(outputs)}, = custom{index}([{", ".join(inputs)}])')
+    
+    lines.append(f'    return [{", ".join(f"n{net}" for net in netlist.output_nets)}]')
+    return '\n'.join(lines) + '\n'
+
+def compile_function(netlist: Netlist):
+    if netlist in _compiled_functions:
+        return _compiled_functions[netlist]
+    
+    function = None
+    source = generate_source(netlist)
+    if source is not None:
+        namespace = {'clock': time.time}
+        for index, record in enumerate(netlist.gates):
+            if record.kind == 'Custom':
+                namespace[f'custom{index}'] = compile_function(record.netlist)
+        exec(compile(source, f'<circuit {netlist.name}>', 'exec'), namespace)
+        function = namespace['logic']
+    
+    _compiled_functions[netlist] = function
+    return function
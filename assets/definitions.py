@@ -0,0 +1,96 @@
+import hashlib
+import functools
+from assets.codegen import compile_function
+from assets.netlist import Netlist, compile_circuit, flatten_netlist
+from assets.netlist_cache import NetlistCache
+from assets.simulation import Simulator, get_truth_table
+from assets.settings import USE_GENERATED_LOGIC, TRUTH_TABLE_MAX_INPUTS, TRUTH_TABLE_CACHE_SIZE
+
+class GateDefinition:
+    def __init__(self, key: str, name: str, netlist: Netlist) -> None:
+        self.key = key
+        self.name = name
+        self.netlist = netlist
+        self.is_combinational = not (self.netlist.has_timer or self.netlist.has_feedback)
+        self.truth_table = None
+        
+        if self.is_combinational and len(self.netlist.input_nets) <= TRUTH_TABLE_MAX_INPUTS:
+            self.truth_table = get_truth_table(self.netlist)
+            self.logic_func = self._table_logic_func
+        else:
+            self.logic_func = compile_function(self.netlist) if USE_GENERATED_LOGIC else None
+            if self.is_combinational:
+                self._evaluate = self.logic_func if self.logic_func is not None else Simulator(self.netlist).evaluate
+                self._cached_evaluate = functools.lru_cache(maxsize=TRUTH_TABLE_CACHE_SIZE)(self._evaluate_input_states)
+                self.logic_func = self._cached_logic_func
+    
+    def _table_logic_func(self, inputs):
+        index = 0
+        for state in inputs:
+            index = (index << 1) | (1 if state else 0)
+        return self.truth_table[index]
+    
+    def _evaluate_input_states(self, input_states: tuple):
+        return tuple(self._evaluate(list(input_states)))
+    
+    def _cached_logic_func(self, inputs):
+        return self._cached_evaluate(tuple(1 if state else 0 for state in inputs))
+
+_definitions: dict[str, GateDefinition] = {}
+_circuit_dict_keys: dict[int, tuple[dict, str]] = {}
+_CIRCUIT_DICT_CACHE_SIZE = 1024
+_netlist_caches: list[NetlistCache] = []
+
+def add_netlist_cache(cache: NetlistCache):
+    _netlist_caches.insert(0, cache)
+
+def remove_netlist_cache(cache: NetlistCache):
+    if cache in _netlist_caches:
+        _netlist_caches.remove(cache)
+
+def get_definitions() -> dict[str, GateDefinition]:
+    return dict(_definitions)
+
+def _get_topology(circuit_dict: dict) -> tuple:
+    gates = []
+    for gate_info in circuit_dict['gates']:
+        logic = gate_info['logic_func_or_circuit_or_circuit_dict']
+        if isinstance(logic, dict):
+            logic = get_definition_key(logic)
+        gates.append((logic, gate_info['input_amt'], gate_info['output_amt']))
+    wires = sorted({tuple(sorted(nodes)) for nodes in circuit_dict['wire_connected_indexes']})
+    
+    return len(circuit_dict['input_node_objects']), len(circuit_dict['output_node_objects']), tuple(gates), tuple(wires)
+
+def get_definition_key(circuit_dict: dict) -> str:
+    known = _circuit_dict_keys.get(id(circuit_dict))
+    if known is not None and known[0] is circuit_dict:
+        return known[1]
+    
+    key = hashlib.sha1(repr(_get_topology(circuit_dict)).encode()).hexdigest()
+    
+    if len(_circuit_dict_keys) >= _CIRCUIT_DICT_CACHE_SIZE:
+        _circuit_dict_keys.pop(next(iter(_circuit_dict_keys)))
+    _circuit_dict_keys[id(circuit_dict)] = (circuit_dict, key)
+    return key
+
+def _get_cached_netlist(key: str) -> Netlist | None:
+    for cache in _netlist_caches:
+        netlist = cache.get(key)
+        if netlist is not None:
+            return netlist
+
+def get_definition(circuit_dict: dict) -> GateDefinition:
+    key = get_definition_key(circuit_dict)
+    definition = _definitions.get(key)
+    if definition is None:
+        netlist = _get_cached_netlist(key)
+        if netlist is None:
+            netlist = flatten_netlist(compile_circuit(circuit_dict, get_definition_netlist))
+        definition = GateDefinition(key, circuit_dict['name'], netlist)
+        _definitions[key] = definition
+    
+    return definition
+
+def get_definition_netlist(circuit_dict: dict) -> Netlist:
+    return get_definition(circuit_dict).netlist
@@ -0,0 +1,25 @@
+import pygame
+from collections import OrderedDict
+from assets.modules import get_color_key
+from assets.settings import TEXT_SURFACE_CACHE_SIZE
+
+_fonts: dict = {}
+_text_surfaces: OrderedDict = OrderedDict()
+
+def get_font(name: str, size: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+    key = name, size, bold, italic
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+    return font
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+    key = font, text, antialias, get_color_key(color)
+    surf = _text_surfaces.get(key)
+    if surf is None:
+        surf = _text_surfaces[key] = font.render(text, antialias, color)
+        if len(_text_surfaces) > TEXT_SURFACE_CACHE_SIZE:
+            _text_surfaces.popitem(last=False)
+    else:
+        _text_surfaces.move_to_end(key)
+    return surf
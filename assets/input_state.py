@@ -0,0 +1,24 @@
+import pygame
+
+class InputState:
+    def __init__(self) -> None:
+        self.active = False
+        self.pressed = (False, False, False)
+        self.mouse_pos = (0, 0)
+    
+    def update(self):
+        self.active = True
+        self.pressed = pygame.mouse.get_pressed()
+        self.mouse_pos = pygame.mouse.get_pos()
+
+input_state = InputState()
+
+def get_mouse_pressed():
+    if input_state.active:
+        return input_state.pressed
+    return pygame.mouse.get_pressed()
+
+def get_mouse_pos():
+    if input_state.active:
+        return input_state.mouse_pos
+    return pygame.mouse.get_pos()
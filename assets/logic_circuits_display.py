@@ -1,7 +1,10 @@
 import pygame
+from typing import Callable
 from assets.settings import *
 from assets.widgets import Button
 from assets.modules import is_clicked
+from assets.fonts import get_font
+from assets.input_state import get_mouse_pressed, get_mouse_pos
 from assets.logic_gates_components import *
 from assets.widgets import Button, ScrollableSurface
 from pygame_textinput import TextInputManager, TextInputVisualizer
@@ -21,15 +24,17 @@ class CircuitDisplay:
         
         self._theme_color = 'red'
         
+        self.version = 0
+        
         self.new_gate_tracker = None
         
-        self.circuit_editors: list[Circuit] = []
+        self.circuit_editors: list[Circuit | dict | Callable[[], dict]] = []
         self.circuit_index = -1
         
         self.pick_selected_gates: list[GateBaseClass] = []
         self.multi_selected_gates: list[GateBaseClass] = []
         
-        self.textinput_font = pygame.font.SysFont('Consolas', 55)
+        self.textinput_font = get_font('Consolas', 55)
         self.ref_mouse_pos_selected = self.ref_mouse_pos = self.mouse_pos = pygame.mouse.get_pos()
         self.events = pygame.event.get()
         
@@ -145,12 +150,27 @@ class CircuitDisplay:
         self.right_frame_button.configure(bg_color=self.circuit.input_node_objects[0][0].bg_color)
         self._recompile_gate_option_viewer()
     
-    def get_dict(self):
+    def _mark_modified(self):
+        self.version += 1
+    
+    def is_settled(self):
+        return self.circuit.settled
+    
+    def get_animation_phase(self):
+        if self.textinput_focused:
+            return pygame.time.get_ticks() // self.textinput.cursor_blink_interval
+    
+    def get_project_dict(self):
         return {
             'theme_color': self.theme_color,
             'circuit index': self.circuit_index,
-            'circuits': [circuit.get_dict() for circuit in self.circuit_editors],
-            'gate options': [gate_op.get_dict() for gate_op in self.gate_options[len(self.constant_gate_options):]]   
+            'gate options': [gate_op.get_dict() for gate_op in self.gate_options[len(self.constant_gate_options):]]
+        }
+    
+    def get_dict(self):
+        return {
+            **self.get_project_dict(),
+            'circuits': [self._get_circuit_info(circuit) for circuit in self.circuit_editors]
         }
     
     def set_dict(self, d: dict):
@@ -160,11 +180,7 @@ class CircuitDisplay:
         self.circuit_editors.clear()
         self.circuit_index = -1
         
-        for editor_info in circuits_info:
-            circuit = Circuit('_', self.screen, 0, 0, 'red', 1, 1, 1)
-            circuit.set_dict(editor_info)
-            self._make_new_circuit(circuit, circuit.name)
-        
+        self.circuit_editors += circuits_info[:self.max_circuit_amt]
         self._change_circuit(circuit_index)
         
         while len(self.gate_circuits) > len(self.constant_gate_options):
@@ -177,12 +193,7 @@ class CircuitDisplay:
             gate.update()
             self.gate_options.append(gate)
             self._add_gate_to_viewer(gate)
-            if isinstance(gate.logic_func_or_circuit_or_circuit_dict, dict):
-                tmp_circuit = Circuit('_', self.screen, 1, 1, 'red', 1, 1, 1)
-                tmp_circuit.set_dict(gate.logic_func_or_circuit_or_circuit_dict)
-            else:
-                tmp_circuit = gate.logic_func_or_circuit_or_circuit_dict
-            self.gate_circuits.append(tmp_circuit)
+            self.gate_circuits.append(gate.logic_func_or_circuit_or_circuit_dict)
         
         self.theme_color = d['theme_color']
         self.textinput_focused = True
@@ -210,9 +221,30 @@ class CircuitDisplay:
                 self.edit_indices.remove(index_info)
                 break
         self.circuit_editors.pop(self.circuit_index + 1)
+        self._mark_modified()
+    
+    def _get_circuit_info(self, circuit):
+        if isinstance(circuit, Circuit):
+            return circuit.get_dict()
+        elif isinstance(circuit, dict):
+            return circuit
+        return circuit()
+    
+    def _materialize_circuit(self, circuit):
+        if isinstance(circuit, Circuit):
+            return circuit
+        
+        new_circuit = Circuit('_', self.screen, 1, 1, 'red', 1, 1, 1)
+        new_circuit.set_dict(self._get_circuit_info(circuit))
+        return new_circuit
     
     def _change_circuit(self, index):
+        if index != self.circuit_index:
+            self._mark_modified()
         self.circuit_index = index
+        if not isinstance(self.circuit_editors[self.circuit_index], Circuit):
+            self.circuit_editors[self.circuit_index] = self._materialize_circuit(self.circuit_editors[self.circuit_index])
+            self.circuit_editors[self.circuit_index].on_modified_func = self._mark_modified
         self.circuit: Circuit = self.circuit_editors[self.circuit_index]
         self.textinput.value = self.circuit.name
         self.new_gate_tracker = self.circuit.gate
@@ -228,9 +260,16 @@ class CircuitDisplay:
             self.gate_circuits.pop(self.gate_options.index(old_gate) - len(self.constant_gate_options))
             self.gate_options.remove(old_gate)
             self._recompile_gate_option_viewer()
+            self._mark_modified()
         
         return func
     
+    def _get_canvas_rect(self):
+        return pygame.Rect(self.left_frame_button.rect.left,
+                           self.top_frame_rect.top,
+                           self.right_frame_button.rect.right - self.left_frame_button.rect.left,
+                           self.bottom_frame_rect.bottom - self.top_frame_rect.top)
+    
     def _get_textinput_rect(self):
         return self.textinput.surface.get_rect(midtop=(self.screen.get_width() / 2, 30))
     
@@ -242,7 +281,7 @@ class CircuitDisplay:
                                  len(self.circuit.output_node_objects),
                                  self.circuit.copy())
         new_gate.update()
-                
+        
         self.circuit.gate = new_gate, self.circuit.copy()
         
         self.textinput.value = '_'
@@ -253,6 +292,7 @@ class CircuitDisplay:
             wire.disconnect_all()
         self.circuit.gates.clear()
         self.circuit.wires.clear()
+        self.circuit._invalidate_netlist()
     
     def _add_gate_to_viewer(self, gate: GateBaseClass):
         display_gate = gate.copy()
@@ -287,6 +327,7 @@ class CircuitDisplay:
         self.new_gate_tracker = self.circuit.gate
         self.gate_circuits.insert(circuits_edit_index, circuit)
         self._recompile_gate_option_viewer()
+        self._mark_modified()
     
     def _recompile_gate_option_viewer(self):
         self.display_gate_buttons_list.clear()
@@ -343,7 +384,8 @@ class CircuitDisplay:
                     self._change_circuit(circuit_index)
                     break
             else:
-                circuit = self.gate_circuits[self.edit_index - len(self.constant_gate_options)]
+                circuit = self._materialize_circuit(self.gate_circuits[self.edit_index - len(self.constant_gate_options)])
+                self.gate_circuits[self.edit_index - len(self.constant_gate_options)] = circuit
                 self._make_new_circuit(circuit, circuit.name)
                 self.edit_indices.append((self.edit_index, self.circuit_index))
         
@@ -353,6 +395,7 @@ class CircuitDisplay:
         if len(self.circuit_editors) < self.max_circuit_amt:
             name = DEFAULT_CIRCUIT_NAME if name is None else name
             circuit = Circuit(name, self.screen, self.screen.get_height() - self.add_buttons_border_offset - self.add_buttons_size[1], self.add_buttons_size[1], self.theme_color, self.input_output_node_border_offset, self.input_output_node_border_width, self.top_level) if circuit is None else circuit
+            circuit.on_modified_func = self._mark_modified
             self.circuit_editors.insert(self.circuit_index + 1, circuit)
             self._change_circuit(self.circuit_index + 1)
     
@@ -360,7 +403,7 @@ class CircuitDisplay:
         mouse_rect = pygame.Rect(*self.mouse_pos, 1, 1)
         mouse_clicked, _, _, _ = is_clicked(mouse_rect, self.textinput_rect, on_left_clicked_func=self._force_textinput_focus)
         
-        if pygame.mouse.get_pressed()[0] and not mouse_clicked:
+        if get_mouse_pressed()[0] and not mouse_clicked:
             if not self.has_textinput_focus:
                 self._free_textinput_focus()
                 self.has_textinput_focus = True
@@ -369,7 +412,9 @@ class CircuitDisplay:
         
         if self.textinput_focused:
             self.textinput.update(self.events)
-            self.circuit.name = self.textinput.value
+            if self.circuit.name != self.textinput.value:
+                self.circuit.name = self.textinput.value
+                self.circuit._mark_modified()
         
         self.textinput_rect = self._get_textinput_rect()
         self.screen.blit(self.textinput.surface, self.textinput_rect)
@@ -383,7 +428,7 @@ class CircuitDisplay:
         
         self.selected_display_rect.centerx = self.selected_display_ref_pos[0] + (self.mouse_pos[0] - self.ref_mouse_pos_selected[0])
         self.selected_display_rect.centery = self.selected_display_ref_pos[1] + (self.mouse_pos[1] - self.ref_mouse_pos_selected[1])
-         
+        
         self.selected_button.set_pos(center=(dx, dy))
         for index, gate in enumerate(self.multi_selected_gates):
             ref_pos = self.multi_selected_gates_ref_pos[index]
@@ -415,8 +460,7 @@ class CircuitDisplay:
     
     def _on_mouse_button_not_clicked(self):
         if bool(self.selector_rect.x + self.selector_rect.y + self.selector_rect.width + self.selector_rect.height):
-            for index in range(len(self.circuit.gates)):
-                gate = self.circuit.gates[index]
+            for gate in self.circuit.get_gates_in_rect(self.selector_rect):
                 gate_rect = gate.get_rect()
                 
                 x_collide = self.selector_rect.left < gate_rect.x < self.selector_rect.right - gate_rect.width
@@ -449,7 +493,7 @@ class CircuitDisplay:
         self.ref_mouse_pos = self.mouse_pos
     
     def update(self, events, bg_color):
-        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_pos = get_mouse_pos()
         self.events = events
         self.keys = pygame.key.get_pressed()
         self.bg_color = bg_color
@@ -462,7 +506,7 @@ class CircuitDisplay:
         pygame.draw.rect(self.screen, 'green', self.selected_display_rect, 3)
         
         _, _, _, c = self.selected_button.update()
-        if pygame.mouse.get_pressed()[0]:
+        if get_mouse_pressed()[0]:
             if not c or self.circuit.is_anything_hovered():
                 self.selected_button.set_pos(topleft=(0, 0))
                 self.selected_button.configure(size=(0, 0))
@@ -474,7 +518,7 @@ class CircuitDisplay:
                 
                 self.multi_selected_gates.clear()
         
-        self.circuit.update(self.gate_options_hovered, self.pick_selected_gates, self.bottom_frame_rect.bottom)
+        self.circuit.update(self.gate_options_hovered, self.pick_selected_gates, self.bottom_frame_rect.bottom, self._get_canvas_rect())
         
         pygame.draw.rect(self.screen, self.bg_color, (0, 0, self.screen.get_width(), self.top_frame_rect.top))
         pygame.draw.rect(self.screen, self.bg_color, (0, self.bottom_frame_rect.bottom, self.screen.get_width(), self.screen.get_height() - self.bottom_frame_rect.bottom))
@@ -496,6 +540,7 @@ class CircuitDisplay:
             self._add_gate_to_viewer(gate)
             self.gate_circuits.append(circuit)
             self.new_gate_tracker = self.circuit.gate
+            self._mark_modified()
         
         self.gate_option_viewer.update()
         
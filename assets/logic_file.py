@@ -0,0 +1,522 @@
+import io
+import os
+import sys
+import zlib
+import pickle
+import struct
+import functools
+from array import array
+
+MAGIC = b'IFLG'
+FORMAT_VERSION = 1
+
+JOURNAL_MAGIC = b'IFLJ'
+JOURNAL_VERSION = 2
+JOURNAL_SUFFIX = '.journal'
+JOURNAL_MIN_COMPACT_SIZE = 64 * 1024
+
+_HEADER = struct.Struct('<4sHHQQQQ')
+_JOURNAL_HEADER = struct.Struct('<4sHI')
+_JOURNAL_RECORD = struct.Struct('<BII')
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _TUPLE, _DICT, _SMALL_INT, _VALUE_REF = range(11)
+_LOGIC_STR, _LOGIC_DEFINITION, _LOGIC_VALUE = range(3)
+_RECORD_PROJECT, _RECORD_CIRCUIT = range(2)
+
+def _pack_array(typecode: str, values) -> bytes:
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+def _unpack_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+def _to_number(value: float):
+    return int(value) if value.is_integer() else value
+
+def _to_point(values, index: int):
+    return (_to_number(values[index]), _to_number(values[index + 1]))
+
+class _LogicFileWriter:
+    def __init__(self, base: 'LogicFileReader' = None) -> None:
+        self.strings = {}
+        self.values = {}
+        self.definitions = []
+        self.definition_ids = {}
+        self.definition_object_ids = {}
+        
+        if base is not None:
+            self.strings = {string: index for index, string in enumerate(base.strings)}
+            self.values = {encoded: index for index, encoded in enumerate(base.values)}
+            self.definition_ids = {payload: index for index, payload in enumerate(base.get_definition_payloads())}
+        self.string_base = len(self.strings)
+        self.value_base = len(self.values)
+        self.definition_base = len(self.definition_ids)
+    
+    def _string(self, string: str):
+        return self.strings.setdefault(string, len(self.strings))
+    
+    def _write_value(self, out: io.BytesIO, value):
+        if value is None:
+            out.write(_U8.pack(_NONE))
+        elif isinstance(value, bool):
+            out.write(_U8.pack(_TRUE if value else _FALSE))
+        elif isinstance(value, int):
+            if -2 ** 31 <= value < 2 ** 31:
+                out.write(_U8.pack(_SMALL_INT) + _I32.pack(value))
+            else:
+                out.write(_U8.pack(_INT) + _I64.pack(value))
+        elif isinstance(value, float):
+            out.write(_U8.pack(_FLOAT) + _F64.pack(value))
+        elif isinstance(value, str):
+            out.write(_U8.pack(_STR) + _U32.pack(self._string(value)))
+        elif isinstance(value, list | tuple | dict):
+            value_out = io.BytesIO()
+            if isinstance(value, dict):
+                value_out.write(_U8.pack(_DICT) + _U32.pack(len(value)))
+                for key, item in value.items():
+                    self._write_value(value_out, key)
+                    self._write_value(value_out, item)
+            else:
+                value_out.write(_U8.pack(_LIST if isinstance(value, list) else _TUPLE) + _U32.pack(len(value)))
+                for item in value:
+                    self._write_value(value_out, item)
+            out.write(_U8.pack(_VALUE_REF) + _U32.pack(self.values.setdefault(value_out.getvalue(), len(self.values))))
+        else:
+            raise TypeError(f'Cannot store {type(value).__name__} in a .logic file')
+    
+    def _write_positions(self, out: io.BytesIO, values: list[float]):
+        out.write(_U32.pack(len(values)) + _pack_array('d', values))
+    
+    def _write_indexes(self, out: io.BytesIO, values: list[int]):
+        out.write(_U32.pack(len(values)) + _pack_array('I', values))
+    
+    def _write_gates(self, out: io.BytesIO, gates: list[dict]):
+        out.write(_U32.pack(len(gates)))
+        positions = []
+        for gate_info in gates:
+            out.write(_U32.pack(self._string(gate_info['name'])) + _U32.pack(gate_info['input_amt']) + _U32.pack(gate_info['output_amt']))
+            
+            logic = gate_info['logic_func_or_circuit_or_circuit_dict']
+            if isinstance(logic, dict):
+                out.write(_U8.pack(_LOGIC_DEFINITION) + _U32.pack(self.add_definition(logic)))
+            elif isinstance(logic, str):
+                out.write(_U8.pack(_LOGIC_STR) + _U32.pack(self._string(logic)))
+            else:
+                out.write(_U8.pack(_LOGIC_VALUE))
+                self._write_value(out, logic)
+            
+            self._write_value(out, gate_info['node_on_color'])
+            self._write_value(out, gate_info['node_off_color'])
+            positions += gate_info['pos']
+        
+        self._write_positions(out, positions)
+    
+    def _write_wires(self, out: io.BytesIO, wires: list[dict]):
+        out.write(_U32.pack(len(wires)))
+        segment_counts = []
+        positions = []
+        for wire_info in wires:
+            self._write_value(out, wire_info['width'])
+            self._write_value(out, wire_info['color_on'])
+            self._write_value(out, wire_info['color_off'])
+            
+            for start, end in [wire_info['first_pos_tracker']] + list(wire_info['breakpoints']):
+                positions += [*start, *end]
+            segment_counts.append(len(wire_info['breakpoints']))
+        
+        self._write_indexes(out, segment_counts)
+        self._write_positions(out, positions)
+    
+    def _write_circuit(self, out: io.BytesIO, d: dict):
+        out.write(_U32.pack(self._string(d['name'])))
+        for key in ('node_base_line', 'add_nodes_buttons_height', 'border_offset', 'border_width', 'top_level', 'theme_color'):
+            self._write_value(out, d[key])
+        
+        self._write_positions(out, d['input_node_objects'])
+        self._write_positions(out, d['output_node_objects'])
+        self._write_gates(out, d['gates'])
+        self._write_wires(out, d['wires'])
+        
+        self._write_indexes(out, [len(node_indexes) for node_indexes in d['wire_connected_indexes']])
+        self._write_indexes(out, [node_index for node_indexes in d['wire_connected_indexes'] for node_index in node_indexes])
+    
+    def add_definition(self, d: dict):
+        known = self.definition_object_ids.get(id(d))
+        if known is not None and known[0] is d:
+            return known[1]
+        
+        out = io.BytesIO()
+        self._write_circuit(out, d)
+        payload = out.getvalue()
+        
+        definition_id = self.definition_ids.get(payload)
+        if definition_id is None:
+            definition_id = self.definition_base + len(self.definitions)
+            self.definition_ids[payload] = definition_id
+            self.definitions.append(payload)
+        
+        self.definition_object_ids[id(d)] = (d, definition_id)
+        return definition_id
+    
+    def dumps(self, info: dict) -> bytes:
+        project = io.BytesIO()
+        self._write_value(project, info['theme_color'])
+        project.write(_I64.pack(info['circuit index']))
+        project.write(_U32.pack(len(info['circuits'])))
+        for circuit_info in info['circuits']:
+            circuit_out = io.BytesIO()
+            self._write_circuit(circuit_out, circuit_info)
+            project.write(_U32.pack(len(circuit_out.getvalue())) + circuit_out.getvalue())
+        self._write_gates(project, info['gate options'])
+        
+        out = io.BytesIO()
+        out.write(bytes(_HEADER.size))
+        
+        definition_offsets = []
+        for payload in self.definitions:
+            definition_offsets.append(out.tell())
+            out.write(payload)
+        
+        project_offset = out.tell()
+        out.write(project.getvalue())
+        
+        strings_offset = out.tell()
+        strings = list(self.strings)[self.string_base:]
+        out.write(_U32.pack(len(strings)))
+        for string in strings:
+            encoded = string.encode('utf-8')
+            out.write(_U32.pack(len(encoded)) + encoded)
+        
+        values_offset = out.tell()
+        values = list(self.values)[self.value_base:]
+        out.write(_U32.pack(len(values)))
+        for encoded in values:
+            out.write(_U32.pack(len(encoded)) + encoded)
+        
+        definitions_offset = out.tell()
+        out.write(_U32.pack(len(definition_offsets)) + _pack_array('Q', definition_offsets))
+        
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, strings_offset, values_offset, definitions_offset, project_offset))
+        return out.getvalue()
+
+class LogicFileReader:
+    def __init__(self, data: bytes, base: 'LogicFileReader' = None) -> None:
+        self.data = data
+        self.base = base
+        magic, version, _, strings_offset, values_offset, definitions_offset, self.project_offset = _HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a .logic file')
+        if version > FORMAT_VERSION:
+            raise ValueError(f'.logic file version {version} is newer than the supported version {FORMAT_VERSION}')
+        
+        stream = io.BytesIO(self.data)
+        stream.seek(strings_offset)
+        self.strings = list(self.base.strings) if self.base is not None else []
+        for _ in range(self._read_u32(stream)):
+            self.strings.append(stream.read(self._read_u32(stream)).decode('utf-8'))
+        
+        stream.seek(values_offset)
+        self.values = list(self.base.values) if self.base is not None else []
+        for _ in range(self._read_u32(stream)):
+            self.values.append(stream.read(self._read_u32(stream)))
+        
+        stream.seek(definitions_offset)
+        count = self._read_u32(stream)
+        self.definition_offsets = _unpack_array('Q', stream.read(count * 8))
+        self.definition_base = len(self.base.definition_offsets) if self.base is not None else 0
+        self.definitions = {}
+    
+    def _read_u8(self, stream: io.BytesIO):
+        return _U8.unpack(stream.read(1))[0]
+    
+    def _read_u32(self, stream: io.BytesIO):
+        return _U32.unpack(stream.read(4))[0]
+    
+    def _read_value(self, stream: io.BytesIO):
+        tag = self._read_u8(stream)
+        if tag == _NONE:
+            return None
+        elif tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        elif tag == _SMALL_INT:
+            return _I32.unpack(stream.read(4))[0]
+        elif tag == _INT:
+            return _I64.unpack(stream.read(8))[0]
+        elif tag == _FLOAT:
+            return _F64.unpack(stream.read(8))[0]
+        elif tag == _STR:
+            return self.strings[self._read_u32(stream)]
+        elif tag == _LIST:
+            return [self._read_value(stream) for _ in range(self._read_u32(stream))]
+        elif tag == _TUPLE:
+            return tuple(self._read_value(stream) for _ in range(self._read_u32(stream)))
+        elif tag == _DICT:
+            return {self._read_value(stream): self._read_value(stream) for _ in range(self._read_u32(stream))}
+        elif tag == _VALUE_REF:
+            return self._read_value(io.BytesIO(self.values[self._read_u32(stream)]))
+        raise ValueError(f'Unknown value tag {tag} in .logic file')
+    
+    def _read_positions(self, stream: io.BytesIO):
+        return _unpack_array('d', stream.read(self._read_u32(stream) * 8))
+    
+    def _read_indexes(self, stream: io.BytesIO):
+        return _unpack_array('I', stream.read(self._read_u32(stream) * 4))
+    
+    def _read_gates(self, stream: io.BytesIO):
+        gates = []
+        for _ in range(self._read_u32(stream)):
+            name = self.strings[self._read_u32(stream)]
+            input_amt = self._read_u32(stream)
+            output_amt = self._read_u32(stream)
+            
+            logic_tag = self._read_u8(stream)
+            if logic_tag == _LOGIC_STR:
+                logic = self.strings[self._read_u32(stream)]
+            elif logic_tag == _LOGIC_DEFINITION:
+                logic = self.get_definition(self._read_u32(stream))
+            else:
+                logic = self._read_value(stream)
+            
+            gates.append({
+                'name': name,
+                'input_amt': input_amt,
+                'output_amt': output_amt,
+                'logic_func_or_circuit_or_circuit_dict': logic,
+                'node_on_color': self._read_value(stream),
+                'node_off_color': self._read_value(stream),
+            })
+        
+        positions = self._read_positions(stream)
+        for index, gate_info in enumerate(gates):
+            gate_info['pos'] = _to_point(positions, index * 2)
+        
+        return gates
+    
+    def _read_wires(self, stream: io.BytesIO):
+        wires = []
+        for _ in range(self._read_u32(stream)):
+            wires.append({
+                'width': self._read_value(stream),
+                'color_on': self._read_value(stream),
+                'color_off': self._read_value(stream),
+            })
+        
+        segment_counts = self._read_indexes(stream)
+        positions = self._read_positions(stream)
+        index = 0
+        for wire_info, segment_count in zip(wires, segment_counts):
+            segments = []
+            for _ in range(segment_count + 1):
+                segments.append([_to_point(positions, index), _to_point(positions, index + 2)])
+                index += 4
+            wire_info['first_pos_tracker'] = segments[0]
+            wire_info['breakpoints'] = segments[1:]
+        
+        return wires
+    
+    def _read_circuit(self, stream: io.BytesIO):
+        d = {'name': self.strings[self._read_u32(stream)]}
+        for key in ('node_base_line', 'add_nodes_buttons_height', 'border_offset', 'border_width', 'top_level', 'theme_color'):
+            d[key] = self._read_value(stream)
+        
+        d['input_node_objects'] = [_to_number(value) for value in self._read_positions(stream)]
+        d['output_node_objects'] = [_to_number(value) for value in self._read_positions(stream)]
+        d['gates'] = self._read_gates(stream)
+        d['wires'] = self._read_wires(stream)
+        
+        counts = self._read_indexes(stream)
+        node_indexes = self._read_indexes(stream)
+        d['wire_connected_indexes'] = []
+        index = 0
+        for count in counts:
+            d['wire_connected_indexes'].append(list(node_indexes[index:index + count]))
+            index += count
+        
+        return d
+    
+    def get_definition_payloads(self) -> list[bytes]:
+        ends = list(self.definition_offsets[1:]) + [self.project_offset]
+        return [self.data[start:end] for start, end in zip(self.definition_offsets, ends)]
+    
+    def get_definition(self, definition_id: int) -> dict:
+        if definition_id < self.definition_base:
+            return self.base.get_definition(definition_id)
+        
+        d = self.definitions.get(definition_id)
+        if d is None:
+            stream = io.BytesIO(self.data)
+            stream.seek(self.definition_offsets[definition_id - self.definition_base])
+            d = self._read_circuit(stream)
+            self.definitions[definition_id] = d
+        
+        return d
+    
+    def read_circuit(self, offset: int) -> dict:
+        stream = io.BytesIO(self.data)
+        stream.seek(offset)
+        return self._read_circuit(stream)
+    
+    def read_project(self, lazy: bool = False) -> dict:
+        stream = io.BytesIO(self.data)
+        stream.seek(self.project_offset)
+        info = {'theme_color': self._read_value(stream), 'circuit index': _I64.unpack(stream.read(8))[0]}
+        
+        circuits = []
+        for _ in range(self._read_u32(stream)):
+            size = self._read_u32(stream)
+            if lazy:
+                circuits.append(functools.partial(self.read_circuit, stream.tell()))
+                stream.seek(size, io.SEEK_CUR)
+            else:
+                circuits.append(self._read_circuit(io.BytesIO(stream.read(size))))
+        info['circuits'] = circuits
+        info['gate options'] = self._read_gates(stream)
+        
+        return info
+
+class LogicJournal:
+    def __init__(self, file_path: str, base_size: int) -> None:
+        self.file_path = file_path
+        self.journal_path = self.file_path + JOURNAL_SUFFIX
+        self.base_size = base_size
+        self.size = 0
+        self.header = None
+        self.base = None
+    
+    def reset(self, data: bytes):
+        self.header = _JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, zlib.crc32(data))
+        self.base = LogicFileReader(data)
+        self.base_size = len(data)
+        self.size = _JOURNAL_HEADER.size
+    
+    def replay(self, info: dict, data: bytes, lazy: bool = False):
+        if not os.path.exists(self.journal_path):
+            return False
+        
+        with open(self.journal_path, 'rb') as file:
+            journal = file.read()
+        if len(journal) < _JOURNAL_HEADER.size:
+            return False
+        magic, version, crc = _JOURNAL_HEADER.unpack_from(journal, 0)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION or crc != zlib.crc32(data):
+            return False
+        self.base = LogicFileReader(data)
+        
+        offset = _JOURNAL_HEADER.size
+        while offset + _JOURNAL_RECORD.size <= len(journal):
+            kind, length, record_crc = _JOURNAL_RECORD.unpack_from(journal, offset)
+            start = offset + _JOURNAL_RECORD.size
+            body = journal[start:start + length]
+            if len(body) != length or zlib.crc32(body) != record_crc:
+                break
+            try:
+                changes = self._read_record(info, kind, body, lazy)
+            except (ValueError, KeyError, IndexError, StopIteration, struct.error):
+                break
+            info.update(changes)
+            offset = start + length
+        
+        if offset != len(journal):
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(offset)
+        self.size = offset
+        return True
+    
+    def _read_record(self, info: dict, kind: int, body: bytes, lazy: bool):
+        if kind == _RECORD_PROJECT:
+            circuit_index = _I64.unpack_from(body, 0)[0]
+            count = _U32.unpack_from(body, 8)[0]
+            sources = _unpack_array('i', body[12:12 + count * 4])
+            record_info = LogicFileReader(body[12 + count * 4:], self.base).read_project(lazy)
+            
+            new_circuits = iter(record_info['circuits'])
+            circuits = [info['circuits'][source] if source >= 0 else next(new_circuits) for source in sources]
+            return {'circuits': circuits, 'theme_color': record_info['theme_color'], 'circuit index': circuit_index, 'gate options': record_info['gate options']}
+        elif kind == _RECORD_CIRCUIT:
+            index = _U32.unpack_from(body, 0)[0]
+            circuits = list(info['circuits'])
+            circuits[index] = LogicFileReader(body[4:], self.base).read_project(lazy)['circuits'][0]
+            return {'circuits': circuits}
+        raise ValueError(f'Unknown journal record kind {kind}')
+    
+    def _append(self, kind: int, body: bytes):
+        record = _JOURNAL_RECORD.pack(kind, len(body), zlib.crc32(body)) + body
+        with open(self.journal_path, 'ab' if self.header is None else 'wb') as file:
+            file.write(record if self.header is None else self.header + record)
+            file.flush()
+            os.fsync(file.fileno())
+        self.header = None
+        self.size += _JOURNAL_RECORD.size + len(body)
+    
+    def append_project(self, info: dict, circuit_sources: list[int], new_circuits: list[dict]):
+        body = _I64.pack(info['circuit index']) + _U32.pack(len(circuit_sources)) + _pack_array('i', circuit_sources)
+        self._append(_RECORD_PROJECT, body + _LogicFileWriter(self.base).dumps({**info, 'circuits': new_circuits}))
+    
+    def append_circuit(self, index: int, circuit_info: dict):
+        body = _U32.pack(index)
+        self._append(_RECORD_CIRCUIT, body + _LogicFileWriter(self.base).dumps({'theme_color': None, 'circuit index': index, 'circuits': [circuit_info], 'gate options': []}))
+    
+    def needs_compaction(self):
+        return self.size > max(self.base_size, JOURNAL_MIN_COMPACT_SIZE)
+
+def dumps(info: dict) -> bytes:
+    return _LogicFileWriter().dumps(info)
+
+def loads(data: bytes, lazy: bool = False) -> dict:
+    return LogicFileReader(data).read_project(lazy)
+
+def _loads_legacy(data: bytes) -> dict:
+    return pickle.loads(data)
+
+def dump(info: dict, file_path: str):
+    with open(file_path, 'wb') as file:
+        file.write(dumps(info))
+
+def load(file_path: str, lazy: bool = False) -> dict:
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    
+    if not data.startswith(MAGIC):
+        return _loads_legacy(data)
+    
+    info = loads(data, lazy)
+    LogicJournal(file_path, len(data)).replay(info, data, lazy)
+    return info
+
+def load_project(file_path: str, lazy: bool = False):
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    
+    if not data.startswith(MAGIC):
+        return _loads_legacy(data), None
+    
+    info = loads(data, lazy)
+    journal = LogicJournal(file_path, len(data))
+    if not journal.replay(info, data, lazy):
+        journal.reset(data)
+    return info, journal
+
+def save_project(info: dict, file_path: str):
+    data = dumps(info)
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, file_path)
+    
+    journal = LogicJournal(file_path, len(data))
+    journal.reset(data)
+    return journal
@@ -4,14 +4,21 @@ from collections import deque
 from typing import Callable
 from assets.settings import *
 from assets.widgets import Button
-from assets.modules import set_color
+from assets.modules import set_color, get_color_key
+from assets.input_state import get_mouse_pressed, get_mouse_pos
 from assets.signal_tranfer import Node, Wire
+from assets.spatial import SpatialGrid, get_segment_rect
+from assets.fonts import get_font, render_text
+from assets.sprite_cache import gate_sprites
+from assets.definitions import GateDefinition, get_definition, get_definition_netlist
+from assets.netlist import PRIMITIVE_KINDS, compile_circuit
+from assets.simulation import Simulator, get_truth_table
 
 class GateBaseClass:
-    def __init__(self, name: str, screen: pygame.Surface, pos: tuple, input_amt, output_amt, logic_func_or_circuit_or_circuit_dict, node_on_click_func: Callable[[Node], None] = None, node_on_color = 'pink', node_off_color = 'grey') -> None:
+    def __init__(self, name: str, screen: pygame.Surface, pos: tuple, input_amt, output_amt, logic_func_or_circuit_or_circuit_dict, node_on_click_func: Callable[[Node], None] = None, node_on_color = 'pink', node_off_color = 'grey', definition: GateDefinition = None) -> None:
         self.name = name
         self.screen = screen
-        self.font = pygame.font.SysFont('Times New Roman', 20)
+        self.font = get_font('Times New Roman', 20)
         
         self.pos = pos
         
@@ -26,7 +33,7 @@ class GateBaseClass:
         self.mouse_pos = pygame.mouse.get_pos()
         self.grid_mouse_pos = tuple(list((i - (i % GRID_SIZE)) for i in self.mouse_pos))
         
-        text_surf = self.font.render(self.name, True, self.text_color)
+        text_surf = render_text(self.font, self.name, True, self.text_color)
         
         self.input_amt = input_amt
         self.output_amt = output_amt
@@ -34,6 +41,11 @@ class GateBaseClass:
         self.logic_func_or_circuit_or_circuit_dict = logic_func_or_circuit_or_circuit_dict
         self.node_on_color = node_on_color
         self.node_off_color = node_off_color
+        self.definition = None
+        self.simulator = None
+        self.version = 0
+        self.on_modified_func = None
+        self.sprite_appearance = None
         
         self.prev_pos = (0, 0)
         self.prev_mouse_pos = (0, 0)
@@ -63,7 +75,8 @@ class GateBaseClass:
                              self.gate_color,
                              hover=False,
                              on_left_mouse_button_clicked=self._toogle_selected,
-                             image=text_surf
+                             image=text_surf,
+                             render=False
                              )
         
         self.output_nodes = [Node(self.screen,
@@ -77,7 +90,7 @@ class GateBaseClass:
                                   is_click_toogleable=False,
                                   on_click_func=self.node_on_click_func) for no in range(self.output_amt)]
         
-        self.configure(logic_func_or_circuit_or_circuit_dict=logic_func_or_circuit_or_circuit_dict)
+        self.configure(logic_func_or_circuit_or_circuit_dict=logic_func_or_circuit_or_circuit_dict, definition=definition)
     
     def _toogle_selected(self):
         any_node_is_touched = bool(sum([node.node_button.rect.collidepoint(self.mouse_pos) for node in self.input_nodes + self.output_nodes]))
@@ -140,12 +153,18 @@ class GateBaseClass:
             
             self.button.configure(screen=self.screen)
         
+        on_modified_func = kwargs.get('on_modified_func')
+        if on_modified_func is not None:
+            self.on_modified_func = on_modified_func
+        
         name = kwargs.get('name')
         if name is not None:
             self.name = name
-            text_surf = self.font.render(self.name, True, self.text_color)
+            text_surf = render_text(self.font, self.name, True, self.text_color)
             size = (text_surf.get_width() + (GATE_TEXT_BORDER_OFFSET_X * 2), max((GATE_TEXT_BORDER_OFFSET_Y + NODE_SIZE) * max(self.input_amt, self.output_amt), text_surf.get_height() + (GATE_TEXT_BORDER_OFFSET_Y * 2)))
             self.button.configure(size=size, image=text_surf)
+            self.sprite_appearance = None
+            self._mark_modified()
         
         pos = kwargs.get('pos')
         if pos is not None:
@@ -156,27 +175,17 @@ class GateBaseClass:
         logic_func_or_circuit_or_circuit_dict = kwargs.get('logic_func_or_circuit_or_circuit_dict')
         if logic_func_or_circuit_or_circuit_dict is not None:
             self.logic_func_or_circuit_or_circuit_dict = logic_func_or_circuit_or_circuit_dict
+            self._mark_modified()
+            definition = kwargs.get('definition')
             if isinstance(self.logic_func_or_circuit_or_circuit_dict, dict):
-                self.logic_circuit = Circuit(self.name, self.screen, 1, 1, 'red', 1, 1, 1)
-                self.logic_circuit.set_dict(self.logic_func_or_circuit_or_circuit_dict)
-                self.logic_circuit.gate_update()
-                self.logic_func = self._logic_func
+                self._set_definition(definition if definition is not None else get_definition(self.logic_func_or_circuit_or_circuit_dict))
             elif isinstance(self.logic_func_or_circuit_or_circuit_dict, str):
-                if '#function' in self.logic_func_or_circuit_or_circuit_dict:
-                    rect = self.get_rect()
-                    match self.logic_func_or_circuit_or_circuit_dict.replace('#function', ''):
-                        case 'And':
-                            self.logic_func = AndGate(self.screen, rect.topleft, self.node_on_click_func).logic_func
-                        case 'Not':
-                            self.logic_func = NotGate(self.screen, rect.topleft, self.node_on_click_func).logic_func
-                        case 'Timer':
-                            self.logic_func = TimerGate(self.screen, rect.topleft, self.node_on_click_func).logic_func
+                if self.logic_func_or_circuit_or_circuit_dict in PRIMITIVE_KINDS:
+                    self.logic_func = PRIMITIVE_LOGIC_FUNCS[PRIMITIVE_KINDS[self.logic_func_or_circuit_or_circuit_dict]]
             elif isinstance(self.logic_func_or_circuit_or_circuit_dict, Callable):
                 self.logic_func = self.logic_func_or_circuit_or_circuit_dict
             elif isinstance(self.logic_func_or_circuit_or_circuit_dict, Circuit):
-                self.logic_circuit = self.logic_func_or_circuit_or_circuit_dict.copy()
-                self.logic_circuit.gate_update()
-                self.logic_func = self._logic_func
+                self._set_definition(definition if definition is not None else get_definition(self.logic_func_or_circuit_or_circuit_dict.get_dict()))
         
         render = kwargs.get('render')
         if render is not None:
@@ -197,6 +206,7 @@ class GateBaseClass:
         node_on_color = kwargs.get('node_on_color')
         if node_on_color is not None:
             self.node_on_color = node_on_color
+            self.sprite_appearance = None
             for node in self.input_nodes:
                 node.configure(color_on=self.node_on_color)
             for node in self.output_nodes:
@@ -205,6 +215,7 @@ class GateBaseClass:
         node_off_color = kwargs.get('node_off_color')
         if node_off_color is not None:
             self.node_off_color = node_off_color
+            self.sprite_appearance = None
             for node in self.input_nodes:
                 node.configure(color_off=self.node_off_color)
             for node in self.output_nodes:
@@ -213,12 +224,14 @@ class GateBaseClass:
         gate_color = kwargs.get('gate_color')
         if gate_color is not None:
             self.gate_color = gate_color
+            self.sprite_appearance = None
             self.button.configure(bg_color=self.gate_color)
         
         text_color = kwargs.get('text_color')
         if text_color is not None:
             self.text_color = text_color
-            text_surf = self.font.render(self.name, True, self.text_color)
+            self.sprite_appearance = None
+            text_surf = render_text(self.font, self.name, True, self.text_color)
             self.button.configure(image=text_surf)
         
         node_on_click_func = kwargs.get('node_on_click_func')
@@ -230,6 +243,7 @@ class GateBaseClass:
         input_amt = kwargs.get('input_amt')
         if input_amt is not None:
             self.input_amt = input_amt
+            self.sprite_appearance = None
             add = (-(self.button.rect.height / 2) + (self.node_size[1] / 2))
             self.input_nodes = [Node(self.screen,
                                     (self.pos[0], self._get_node_y_pos(self.input_amt, ni) + add),
@@ -245,6 +259,7 @@ class GateBaseClass:
         output_amt = kwargs.get('output_amt')
         if output_amt is not None:
             self.output_amt = output_amt
+            self.sprite_appearance = None
             add = (-(self.button.rect.height / 2) + (self.node_size[1] / 2))
             self.output_nodes = [Node(self.screen,
                                     (self.button.rect.right - (self.node_size[0] / 2), self._get_node_y_pos(self.output_amt, no) + add),
@@ -274,7 +289,8 @@ class GateBaseClass:
                              input_amt=self.input_amt,
                              output_amt=self.output_amt,
                              logic_func_or_circuit_or_circuit_dict=self.logic_func_or_circuit_or_circuit_dict,
-                             node_on_click_func=self.node_on_click_func)
+                             node_on_click_func=self.node_on_click_func,
+                             definition=self.definition)
         gate.configure(gate_color=self.gate_color, text_color=self.text_color, node_on_color=self.node_on_color, node_off_color=self.node_off_color)
         
         return gate
@@ -285,7 +301,13 @@ class GateBaseClass:
         for node in self.output_nodes:
             node.disconnect_all()
     
+    def _mark_modified(self):
+        self.version += 1
+        if self.on_modified_func is not None:
+            self.on_modified_func()
+    
     def set_pos(self, pos):
+        prev_pos = self.pos
         prev_x, prev_y = self.button.rect.x, self.button.rect.y
         self.button.set_pos(center=pos)
         for node in self.input_nodes + self.output_nodes:
@@ -294,6 +316,8 @@ class GateBaseClass:
             self.pos = self.input_nodes[0].node_button.rect.topleft
         else:
             self.pos = self.button.rect.topleft
+        if self.pos != prev_pos:
+            self._mark_modified()
     
     def get_input_nodes(self):
         return self.input_nodes
@@ -309,41 +333,95 @@ class GateBaseClass:
             node_in.node_button.new_mouse_pos = True
             node_in.node_button.mouse_pos = self.mouse_pos
             node_in.update()
-            node_in.configure(render=self.render)
+            node_in.configure(render=False)
             node_in.node_button.configure(disabled=self.disabled)
         
         for node_out in self.output_nodes:
             node_out.node_button.new_mouse_pos = True
             node_out.node_button.mouse_pos = self.mouse_pos
             node_out.update()
-            node_out.configure(render=self.render)
+            node_out.configure(render=False)
             node_out.node_button.configure(disabled=self.disabled)
     
-    def _logic_func(self, inputs):
-        self.logic_circuit.set_inputnodes(inputs)
-        self.logic_circuit.gate_update_logic()
-        
-        return [self.logic_circuit.output_node_objects[index][0].get_state() for index in range(len(self.logic_circuit.output_node_objects))]
+    def _get_sprite_appearance(self):
+        if self.sprite_appearance is None:
+            rect = self.get_rect()
+            self.sprite_appearance = (self.name,
+                                      get_color_key(self.text_color),
+                                      get_color_key(self.gate_color),
+                                      get_color_key(self.node_on_color),
+                                      get_color_key(self.node_off_color),
+                                      self.input_amt,
+                                      self.output_amt,
+                                      rect.size,
+                                      tuple(self.button.rect.move(-rect.x, -rect.y)),
+                                      tuple(tuple(node.get_rect().move(-rect.x, -rect.y)) for node in self.input_nodes + self.output_nodes))
+        return self.sprite_appearance
+    
+    def _get_sprite_key(self):
+        node_states = 0
+        for bit, node in enumerate(self.input_nodes + self.output_nodes):
+            if node.state:
+                node_states |= 1 << bit
+        return self._get_sprite_appearance(), node_states
     
-    def logic(self, input_states):
-        outputs = self.logic_func(input_states)
-        for index, state in enumerate(outputs):
-            self.output_nodes[index].set_state(state)
+    def _render_sprite(self):
+        rect = self.get_rect()
+        sprite = pygame.Surface(rect.size, pygame.SRCALPHA)
+        buttons = [(self.button, self.gate_color)] + [(node.node_button, node.color_on if node.state else node.color_off) for node in self.input_nodes + self.output_nodes]
+        for button, color in buttons:
+            pygame.draw.rect(sprite, set_color(color, 255), button.rect.move(-rect.x, -rect.y), 0, button.border_radius, button.border_top_left_radius, button.border_top_right_radius, button.border_bottom_left_radius, button.border_bottom_right_radius)
+            if button.image_surf is not None:
+                sprite.blit(button.image_surf, button.img_rect.move(-rect.x, -rect.y))
+        
+        return sprite
+    
+    def _are_nodes_recolored(self):
+        for node in self.input_nodes + self.output_nodes:
+            if node.node_button.bg_color is not (node.color_on if node.state else node.color_off):
+                return False
+        return True
+    
+    def _is_at_rest(self):
+        if self.disabled or self.button.button_opacity != 255 or self.button.bg_color is not self.gate_color:
+            return False
+        for node in self.input_nodes + self.output_nodes:
+            if node.node_button.button_opacity != 255:
+                return False
+        return True
+    
+    def _draw(self, nodes_recolored=True):
+        if not (nodes_recolored and self._is_at_rest()):
+            self.button._draw()
+            for node in self.input_nodes + self.output_nodes:
+                node.node_button._draw()
+        else:
+            appearance, node_states = self._get_sprite_key()
+            sprite_rect = pygame.Rect(self.button.rect.x - appearance[8][0], self.button.rect.y - appearance[8][1], *appearance[7])
+            if sprite_rect.colliderect(self.screen.get_clip()):
+                self.screen.blit(gate_sprites.get((appearance, node_states), self._render_sprite), sprite_rect)
+    
+    def _set_definition(self, definition: GateDefinition):
+        self.definition = definition
+        self.simulator = None
+        self.logic_func = self.definition.logic_func
     
     def update(self, index=0, gate_options_hovered=False, is_wire_on = False):
         self.index = index
         self.gate_options_hovered = gate_options_hovered
         self.is_wire_on = is_wire_on
         
-        input_states = [node.get_state() for node in self.input_nodes]
-        self.logic(input_states)
         self.button.update()
-        self.button.configure(disabled=self.disabled, render=self.render)
+        self.button.configure(disabled=self.disabled, render=False)
         
+        nodes_recolored = self._are_nodes_recolored()
         self.update_nodes()
         
+        if self.render:
+            self._draw(nodes_recolored)
+        
         if not self.new_mouse_pos:
-            self.mouse_pos = pygame.mouse.get_pos()
+            self.mouse_pos = get_mouse_pos()
         
         self.button.new_mouse_pos = True
         self.button.mouse_pos = self.mouse_pos
@@ -408,6 +486,21 @@ class Circuit:
         self.render = True
         self.has_circuit_set_state = False
         
+        self.netlist = None
+        self.simulator = None
+        self.net_objects = []
+        self.settled = False
+        
+        self.version = 0
+        self.layout_version = 0
+        self.on_modified_func = None
+        
+        self.spatial_index = SpatialGrid(SPATIAL_CELL_SIZE)
+        self.spatial_dirty = set()
+        self.spatial_version = None
+        self.viewport = None
+        self.visible_items = None
+        
         self.add_input(self.screen.get_height() / 2)
         self.add_output(self.screen.get_height() / 2)
     
@@ -420,15 +513,126 @@ class Circuit:
         self._theme_color = v
         self._recolor(self._theme_color)
     
+    def _mark_modified(self):
+        self.version += 1
+        self.layout_version += 1
+        if self.on_modified_func is not None:
+            self.on_modified_func()
+    
+    def _make_item_modified_func(self, item):
+        def func():
+            self.spatial_dirty.add(item)
+            self._mark_modified()
+        
+        return func
+    
+    def _make_item_moved_func(self, item):
+        def func():
+            self.spatial_dirty.add(item)
+            self.layout_version += 1
+        
+        return func
+    
+    def _get_spatial_rects(self, item):
+        if isinstance(item, Wire):
+            return [get_segment_rect(start, end, 2) for start, end in item.breakpoints]
+        return [item.button.rect] + [node.node_button.rect for node in item.input_nodes + item.output_nodes]
+    
+    def _sync_spatial_index(self):
+        if self.spatial_version == self.layout_version:
+            return
+        
+        items = set(self.gates)
+        items.update(self.wires)
+        for item in set(self.spatial_index) - items:
+            self.spatial_index.remove(item)
+        
+        self.spatial_dirty.update(item for item in items if item not in self.spatial_index)
+        for item in self.spatial_dirty & items:
+            self.spatial_index.update(item, self._get_spatial_rects(item))
+        self.spatial_dirty.clear()
+        self.spatial_version = self.layout_version
+    
+    def get_gates_in_rect(self, rect: pygame.Rect):
+        self._sync_spatial_index()
+        return [item for item in self.spatial_index.query_rect(rect) if isinstance(item, GateBaseClass)]
+    
+    def _update_visible_items(self):
+        if self.viewport is None:
+            self.visible_items = None
+        else:
+            self._sync_spatial_index()
+            self.visible_items = self.spatial_index.query_rect(self.viewport.inflate(VIEWPORT_CULL_MARGIN * 2, VIEWPORT_CULL_MARGIN * 2))
+    
+    def _is_item_visible(self, item):
+        return self.visible_items is None or item in self.visible_items or item in self.spatial_dirty or item not in self.spatial_index
+    
+    def get_node_at(self, pos):
+        for _, _, node in self.input_node_objects:
+            if node.node_button.rect.collidepoint(pos):
+                return node
+        for node, _, _ in self.output_node_objects:
+            if node.node_button.rect.collidepoint(pos):
+                return node
+        
+        self._sync_spatial_index()
+        for item in self.spatial_index.query_point(pos):
+            if isinstance(item, GateBaseClass):
+                for node in item.input_nodes + item.output_nodes:
+                    if node.node_button.rect.collidepoint(pos):
+                        return node
+    
+    def _invalidate_netlist(self):
+        self.simulator = None
+        self._mark_modified()
+    
+    def _compile_netlist(self):
+        self.netlist = compile_circuit(self, get_definition_netlist)
+        
+        functions = {}
+        children = {}
+        for index, record in enumerate(self.netlist.gates):
+            if record.kind == 'Custom':
+                gate = self.gates[record.source_index]
+                if gate.logic_func is not None:
+                    functions[index] = gate.logic_func
+                else:
+                    if gate.simulator is None:
+                        gate.simulator = Simulator(record.netlist)
+                    children[index] = gate.simulator
+        self.simulator = Simulator(self.netlist, functions=functions, children=children)
+        
+        self.net_objects = [[] for _ in range(self.netlist.net_count)]
+        for node, net in zip(self._get_all_nodes(), self.netlist.node_nets):
+            self.net_objects[net].append(node)
+            if node.is_output:
+                self.simulator.states[net] = node.get_state()
+        
+        for wire, net in zip(self.wires, self.netlist.wire_nets):
+            self.net_objects[net].append(wire)
+    
+    def _simulate(self):
+        compiled = self.simulator is None
+        if compiled:
+            self._compile_netlist()
+        
+        self.simulator.set_inputs([node.get_state() for _, _, node in self.input_node_objects])
+        changed_nets = self.simulator.run()
+        if compiled:
+            changed_nets = range(self.netlist.net_count)
+        
+        states = self.simulator.states
+        for net in changed_nets:
+            for signal_transporter in self.net_objects[net]:
+                signal_transporter.set_state(states[net])
+        
+        self.settled = not (changed_nets or self.simulator.pending or self.simulator.deferred or self.netlist.volatile_gates)
+    
     def _get_wire_connected_indexes(self):
-        nodes = self._get_all_nodes()
+        node_indexes = {node: index for index, node in enumerate(self._get_all_nodes())}
         wire_index_connections = []
         for wire in list(self.wires):
-            wire_nodes = []
-            for node in nodes:
-                if wire.is_connected_to(node):
-                    wire_nodes.append(nodes.index(node))
-            wire_index_connections.append(wire_nodes)
+            wire_index_connections.append(sorted(node_indexes[node] for node in {wire.input_node, wire.output_node} if node in node_indexes))
         
         return wire_index_connections
     
@@ -456,11 +660,13 @@ class Circuit:
             circuit.output_node_objects.append([node.copy(), move_button.copy(), button.copy()])
         
         for gate in self.gates:
-            circuit.gates.append(gate.copy())
+            new_gate = gate.copy()
+            new_gate.configure(on_modified_func=circuit._make_item_modified_func(new_gate))
+            circuit.gates.append(new_gate)
         
         for wire in self.wires:
             new_wire = wire.copy()
-            new_wire.configure(delete_func=lambda w: circuit._remove_wire(w))
+            new_wire.configure(delete_func=lambda w: circuit._remove_wire(w), on_modified_func=circuit._make_item_modified_func(new_wire), on_moved_func=circuit._make_item_moved_func(new_wire))
             circuit.wires.append(new_wire)
         
         circuit.wire_connected_trackers = {wire: False for wire in circuit.wires}
@@ -469,9 +675,9 @@ class Circuit:
         for node in circuit_nodes:
             node.configure(on_click_func=circuit.on_node_clicked)
         
-        for index, node_connection in enumerate(self._get_wire_connected_indexes()):
+        for wire, node_connection in zip(circuit.wires, self._get_wire_connected_indexes()):
             for node_index in node_connection:
-                circuit_nodes[node_index].connect(circuit.wires[index])
+                circuit_nodes[node_index].connect(wire)
         
         return circuit
     
@@ -522,6 +728,7 @@ class Circuit:
         for gate_info in gates:
             new_gate = GateBaseClass('_', self.screen, (20, 20), 1, 1, lambda l: l, self.on_node_clicked)
             new_gate.set_dict(gate_info)
+            new_gate.configure(on_modified_func=self._make_item_modified_func(new_gate))
             self.gates.append(new_gate)
         
         for wire in list(self.wires):
@@ -532,16 +739,18 @@ class Circuit:
         for wire_info in wires:
             new_wire = Wire(self.screen, [0, 0], [1, 1], 2, 'red', 'red', delete_func=lambda w: self._remove_wire(w))
             new_wire.set_dict(wire_info)
+            new_wire.configure(on_modified_func=self._make_item_modified_func(new_wire), on_moved_func=self._make_item_moved_func(new_wire))
             new_wire.disconnect_all()
             self.wires.append(new_wire)
         
         self.wire_connected_trackers = {wire: False for wire in self.wires}
         
         nodes = self._get_all_nodes()
-        for index, node_connection in enumerate(wire_connected_indexes):
+        for wire, node_connection in zip(self.wires, wire_connected_indexes):
             for node_index in node_connection:
-                nodes[node_index].connect(self.wires[index])
-
+                nodes[node_index].connect(wire)
+        
+        self._invalidate_netlist()
         self.theme_color = d['theme_color']
     
     def _get_node_on_color(self, color):
@@ -591,6 +800,10 @@ class Circuit:
         total_combinations = 2 ** length
         return ([int(bit) for bit in format(i, f'0{length}b')] for i in range(total_combinations))
     
+    def get_truth_table(self):
+        table = get_truth_table(compile_circuit(self, get_definition_netlist))
+        return [(inputs, list(outputs)) for inputs, outputs in zip(self._generate_combinations(len(self.input_node_objects)), table)]
+    
     def _make_move_input_node_object_func(self, index):
         def func():
             if self.selected_input_node_button_index == -1:
@@ -606,7 +819,7 @@ class Circuit:
                 self.selected_output_node_button_index = index
             else:
                 self.selected_output_node_button_index = -1
-    
+        
         return func
     
     def add_input(self, centery):
@@ -638,6 +851,7 @@ class Circuit:
         
         self.update_input_button_removal = True
         self.input_node_objects.append([ctrl_button, move_button, input_node])
+        self._invalidate_netlist()
         self._recolor(self.theme_color)
         self.selected_input_node_button_index = -1
     
@@ -670,12 +884,14 @@ class Circuit:
         
         self.update_output_button_removal = True
         self.output_node_objects.append([output_node, move_button, ctrl_button])
+        self._invalidate_netlist()
         self._recolor(self.theme_color)
         self.selected_output_node_button_index = -1
     
     def on_node_clicked(self, node: Node):
         if True not in self.wire_connected_trackers.values():
             wire = Wire(self.screen, node.node_button.rect.center, self.grid_mouse_pos, 5, 'pink', 'darkgrey', lambda w: self._remove_wire(w))
+            wire.configure(on_modified_func=self._make_item_modified_func(wire), on_moved_func=self._make_item_moved_func(wire))
             node.connect(wire)
             if node.is_input:
                 if wire.wire_move_buttons:
@@ -683,6 +899,7 @@ class Circuit:
             self.wires.append(wire)
             self._recolor(self.theme_color)
             self.wire_connected_trackers[wire] = True
+            self._invalidate_netlist()
         else:
             curr_wire = None
             for wire, looking in self.wire_connected_trackers.items():
@@ -696,20 +913,16 @@ class Circuit:
             else:
                 wire.disconnect_all()
                 self.wires.remove(curr_wire)
+            self._invalidate_netlist()
     
     def is_anything_hovered(self):
         mouse_rect = pygame.Rect(0, 0, 4, 4)
         mouse_rect.center = self.mouse_pos
         
-        nodes_collided = [node.node_button.rect.collidepoint(self.mouse_pos) for node in self._get_all_nodes()]
-        gate_buttons_collided = [self.gates[index].button.rect.collidepoint(self.mouse_pos) for index in range(len(self.gates))]
-        wires_collided = []
-        for index in range(len(self.wires)):
-            for line in self.wires[index].breakpoints:
-                wires_collided.append(mouse_rect.clipline(line[0], line[1]))
+        if self.get_node_at(self.mouse_pos) is not None:
+            return True
         
-        collisions = wires_collided + gate_buttons_collided + nodes_collided
-        return True in collisions
+        return any(gate.button.rect.collidepoint(self.mouse_pos) for gate in self.get_gates_in_rect(mouse_rect))
     
     def _make_remove_input_func(self, index):
         def func():
@@ -723,6 +936,7 @@ class Circuit:
                     self._remove_wire(wire)
                 self.input_node_objects.remove(self.input_node_objects[index])
                 self.removed_input = True
+                self._invalidate_netlist()
         
         return func
     
@@ -736,6 +950,7 @@ class Circuit:
                 for wire in connected_wires:
                     self._remove_wire(wire)
                 self.output_node_objects.remove(self.output_node_objects[index])
+                self._invalidate_netlist()
         
         return func
     
@@ -751,6 +966,7 @@ class Circuit:
             self.gates[index].disconnect_all_nodes()
             self.gates.remove(self.gates[index])
             self.removed_gate = True
+            self._invalidate_netlist()
             for gate in self.selected_gates:
                 gate.selected = False
                 gate.sub_selected = False
@@ -761,16 +977,14 @@ class Circuit:
         def func():
             new_gate = gate.copy()
             new_gate.set_pos(self.grid_mouse_pos)
+            new_gate.configure(on_modified_func=self._make_item_modified_func(new_gate))
             self.gates.append(new_gate)
             self._recolor(self.theme_color)
             self.selected_gates.append(new_gate)
+            self._invalidate_netlist()
         
         return func
     
-    def set_inputnodes(self, state_list: list[int]):
-        for index, (_, _, node) in enumerate(self.input_node_objects):
-            node.set_state(state_list[index])
-    
     def _remove_wire(self, wire: Wire):
         for button in wire.get_move_buttons():
             if button.rect.collidepoint(self.mouse_pos):
@@ -784,6 +998,7 @@ class Circuit:
                 self.wires.remove(wire)
                 self.removed_wire = True
                 self.wire_connected_trackers.pop(wire)
+                self._invalidate_netlist()
     
     def _set_all_buttons_disable_state(self, state: bool):
         for node, move_but, but in self.output_node_objects:
@@ -810,26 +1025,21 @@ class Circuit:
                 wire = self.wires[index]
                 if display:
                     if self.wire_connected_trackers[wire]:
-                        if pygame.mouse.get_pressed()[2]:
+                        if get_mouse_pressed()[2]:
                             if not self.wire_right_pressed:
                                 self._remove_wire(wire)
                             self.wire_right_pressed = True
                         else:
                             self.wire_right_pressed = False
                         
-                        if pygame.mouse.get_pressed()[0]:
+                        if get_mouse_pressed()[0]:
                             if not self.wire_left_pressed:
-                                for nodes in self._get_all_nodes():
-                                    is_touching_a_connection = nodes.node_button.rect.collidepoint(self.grid_mouse_pos)
-                                    
-                                    if is_touching_a_connection:
-                                        break
-                                else:
+                                if self.get_node_at(self.grid_mouse_pos) is None:
                                     if True not in [button.update()[-1] for _, button in wire.wire_move_buttons]:
                                         wire.add_breakpoint(self.grid_mouse_pos)
                                     self.wire_left_pressed = True
                                     break
-                            
+                                
                                 self.wire_left_pressed = True
                         else:
                             self.wire_left_pressed = False
@@ -838,9 +1048,10 @@ class Circuit:
                             wire.move_breakpoint_ending_point(-1, self.grid_mouse_pos)
                         else:
                             wire.move_breakpoint_starting_point(0, self.grid_mouse_pos)
-                    
+                
+                wire.configure(render=self.render and (self.wire_connected_trackers.get(wire) or self._is_item_visible(wire)))
                 wire.update()
-                wire.configure(render=self.render, mouse_pos=self.mouse_pos)
+                wire.configure(mouse_pos=self.mouse_pos)
                 
                 if display:
                     if self.removed_wire:
@@ -855,9 +1066,10 @@ class Circuit:
                 if display:
                     m_x = pygame.math.clamp(self.mouse_pos[0], self.nodes_box_offset, self.screen.get_width() - self.nodes_box_offset)
                     m_y = pygame.math.clamp(self.mouse_pos[1], self.nodes_box_offset + self.top_level, self.base_line)
-
-                    gate.button.configure(on_right_mouse_button_clicked=self.make_remove_gate_func(index), render=self.render)
-                
+                    
+                    gate.button.configure(on_right_mouse_button_clicked=self.make_remove_gate_func(index))
+                    gate.configure(render=self.render and (gate in self.selected_gates or self._is_item_visible(gate)))
+                    
                     if gate in self.selected_gates:
                         index = self.selected_gates.index(gate)
                     else:
@@ -885,10 +1097,10 @@ class Circuit:
                     r = pygame.Rect(0, 0, *self.in_out_wire_size)
                     r.midleft = ctrl.rect.center
                     pygame.draw.rect(self.screen, 'grey', r)
-                
+                    
                     ctrl.configure(render=self.render, mouse_pos=self.mouse_pos)
                     ctrl.update()
-                
+                    
                     move_but.configure(render=self.render, mouse_pos=self.mouse_pos)
                     move_but.update()
                 
@@ -911,7 +1123,7 @@ class Circuit:
                     
                     move_but.configure(render=self.render, mouse_pos=self.mouse_pos)
                     move_but.update()
-                
+                    
                     but.configure(render=self.render, mouse_pos=self.mouse_pos)
                     but.update()
                 
@@ -924,48 +1136,19 @@ class Circuit:
                         self.update_outputs()
     
     def _update_logic(self):
+        self._simulate()
+        self._update_visible_items()
         self._update_wires_and_connections()
         self._update_gates()
     
-    def gate_update_logic(self):
-        self.update_inputs(False)
-        self._update_wires_and_connections(False)
-        self._update_gates(False)
-        self.update_outputs(False)
-    
-    def gate_update(self):
-        for gate in self.gates:
-            gate.button.set_pos(bottomright=(-200, -200))
-        
-        for wire in self.wires:
-            for index in range(len(wire.breakpoints)):
-                wire.breakpoints[index][0] = [-200, -200]
-                wire.breakpoints[index][1] = [-200, -200]
-        
-        for node in self._get_all_nodes():
-            node.node_button.set_pos(bottomright=(-200, -200))
-        
-        for button, move_but, node in self.input_node_objects:
-            button.set_pos(bottomright=(-200, -200))
-            move_but.set_pos(bottomright=(-200, -200))
-            node.node_button.set_pos(bottomright=(-200, -200))
-        
-        for node, move_but, button in self.output_node_objects:
-            button.set_pos(bottomright=(-200, -200))
-            move_but.set_pos(bottomright=(-200, -200))
-            node.node_button.set_pos(bottomright=(-200, -200))
-        
-        self.render = False
-        self._set_all_buttons_disable_state(True)
-        self.gate_update_logic()
-    
-    def update(self, gate_options_hovered: bool, selected_gates: list[GateBaseClass], base_line: int):
+    def update(self, gate_options_hovered: bool, selected_gates: list[GateBaseClass], base_line: int, viewport: pygame.Rect = None):
         self.selected_gates = selected_gates
         self.gate_options_hovered = gate_options_hovered
         self.base_line = base_line
+        self.viewport = viewport
         
         self.render = True
-        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_pos = get_mouse_pos()
         self.grid_mouse_pos = tuple(list((i - (i % GRID_SIZE)) for i in self.mouse_pos))
         
         self.any_input_node_hovered = bool(sum([int(move_but.rect.collidepoint(self.mouse_pos)) for _, move_but, _ in self.input_node_objects]))
@@ -979,20 +1162,24 @@ class Circuit:
         
         if self.selected_input_node_button_index != -1 and self.selected_input_node_button_index < len(self.input_node_objects):
             but, move_but, node = self.input_node_objects[self.selected_input_node_button_index]
+            if move_but.rect.centery != m_y:
+                self._mark_modified()
             but.set_pos(center=(but.rect.centerx, m_y))
             move_but.set_pos(center=(move_but.rect.centerx, m_y))
             node.node_button.set_pos(center=(node.node_button.rect.centerx, m_y))
             
-            if pygame.mouse.get_pressed()[0]:
+            if get_mouse_pressed()[0]:
                 if not self.any_input_node_hovered:
                     self.selected_input_node_button_index = -1
         elif self.selected_output_node_button_index != -1 and self.selected_output_node_button_index < len(self.output_node_objects):
             node, move_but, but = self.output_node_objects[self.selected_output_node_button_index]
+            if move_but.rect.centery != m_y:
+                self._mark_modified()
             node.node_button.set_pos(center=(node.node_button.rect.centerx, m_y))
             move_but.set_pos(center=(move_but.rect.centerx, m_y))
             but.set_pos(center=(but.rect.centerx, m_y))
             
-            if pygame.mouse.get_pressed()[0]:
+            if get_mouse_pressed()[0]:
                 if  not self.any_output_node_hovered:
                     self.selected_output_node_button_index = -1
         
@@ -1017,19 +1204,30 @@ class Circuit:
 
 
 
+def _and_logic_func(inputs):
+    return [inputs[0] and inputs[1]]
+
+def _not_logic_func(inputs):
+    return [not inputs[0]]
+
+def _timer_logic_func(inputs):
+    return [int(time.time()) % 2]
+
+PRIMITIVE_LOGIC_FUNCS = {
+    'And': _and_logic_func,
+    'Not': _not_logic_func,
+    'Timer': _timer_logic_func,
+}
+
 class AndGate(GateBaseClass):
     def __init__(self, screen, pos, node_on_click_func) -> None:
-        super().__init__('And', screen, pos, 2, 1, lambda inputs: [inputs[0] and inputs[1]], node_on_click_func)
+        super().__init__('And', screen, pos, 2, 1, _and_logic_func, node_on_click_func)
 
 class NotGate(GateBaseClass):
     def __init__(self, screen, pos, node_on_click_func) -> None:
-        super().__init__('Not', screen, pos, 1, 1, lambda inputs: [not inputs[0]], node_on_click_func)
+        super().__init__('Not', screen, pos, 1, 1, _not_logic_func, node_on_click_func)
 
 class TimerGate(GateBaseClass):
     def __init__(self, screen, pos, node_on_click_func) -> None:
-        super().__init__('Timer', screen, pos, 0, 1, self._logic_func, node_on_click_func)
-    
-    def _logic_func(self, inputs):
-        t = [int(time.time()) % 2]
-        return t
+        super().__init__('Timer', screen, pos, 0, 1, _timer_logic_func, node_on_click_func)
 
@@ -1,5 +1,8 @@
 import pygame
 from typing import Callable
+from collections import OrderedDict
+from assets.input_state import get_mouse_pressed
+from assets.settings import CLICK_STATE_CACHE_SIZE
 
 def is_color(color):
     try:
@@ -12,50 +15,81 @@ def is_color(color):
         return True
     return True
 
-def set_color(color, opacity: int):
+def get_color_key(color):
+    return tuple(color) if isinstance(color, list | tuple | pygame.Color) else color
+
+_color_fractions: dict = {}
+_scaled_colors: dict = {}
+_COLOR_CACHE_SIZE = 4096
+
+def _get_color_fractions(color_key, color):
+    color_tuple = _color_fractions.get(color_key)
+    if color_tuple is not None:
+        return color_tuple
+    
     assert is_color(color), f'"{color}" is not a valid color'
     
     if isinstance(color, str):
         if '#' in color:
-            color_tuple = [(abs(255 - (col * 255)) / 255) for col in pygame.Color(color).cmy]
+            color_tuple = tuple((abs(255 - (col * 255)) / 255) for col in pygame.Color(color).cmy)
         else:
-            color_tuple = [i/255 for i in pygame.colordict.THECOLORS[color]]
+            color_tuple = tuple(i/255 for i in pygame.colordict.THECOLORS[color])
     elif isinstance(color, tuple | list | pygame.color.Color):
-        color_tuple = [i/255 for i in color]
+        color_tuple = tuple(i/255 for i in color)
     elif isinstance(color, int):
-        color_tuple = [i/255 for i in pygame.Color(color)]
+        color_tuple = tuple(i/255 for i in pygame.Color(color))
     else:
         raise Exception('Invalid color argument')
-
-    for i in color_tuple[:3]:
-        black = i == 0
-        if not black:
-            break
     
-    color = [255 - opacity for _ in color_tuple] if black else [i * opacity for i in color_tuple]
-    
-    if len(color) >= 4:
-        color = color[:3]
-    
-    return color
+    if len(_color_fractions) >= _COLOR_CACHE_SIZE:
+        _color_fractions.pop(next(iter(_color_fractions)))
+    _color_fractions[color_key] = color_tuple
+    return color_tuple
 
+def set_color(color, opacity: int):
+    key = get_color_key(color), opacity
+    scaled = _scaled_colors.get(key)
+    if scaled is None:
+        color_tuple = _get_color_fractions(key[0], color)
+        
+        for i in color_tuple[:3]:
+            black = i == 0
+            if not black:
+                break
+        
+        scaled = tuple(255 - opacity for _ in color_tuple) if black else tuple(i * opacity for i in color_tuple)
+        
+        if len(scaled) >= 4:
+            scaled = scaled[:3]
+        
+        if len(_scaled_colors) >= _COLOR_CACHE_SIZE:
+            _scaled_colors.pop(next(iter(_scaled_colors)))
+        _scaled_colors[key] = scaled
+    
+    return list(scaled)
 
-_left_mouse_clicked_dict = {}
-_left_mouse_clicked_outside_dict = {}
-_middle_mouse_clicked_dict = {}
-_middle_mouse_clicked_outside_dict = {}
-_right_mouse_clicked_dict = {}
-_right_mouse_clicked_outside_dict = {}
 
-_left_mouse_tracker_clicked_dict = {}
-_left_mouse_tracker_not_clicked_dict = {}
-_middle_mouse_tracker_clicked_dict = {}
-_middle_mouse_tracker_not_clicked_dict = {}
-_right_mouse_tracker_clicked_dict = {}
-_right_mouse_tracker_not_clicked_dict = {}
+class ClickState:
+    __slots__ = ('left_clicked', 'left_clicked_outside', 'middle_clicked', 'middle_clicked_outside', 'right_clicked', 'right_clicked_outside',
+                 'left_tracker_clicked', 'left_tracker_not_clicked', 'middle_tracker_clicked', 'middle_tracker_not_clicked', 'right_tracker_clicked', 'right_tracker_not_clicked',
+                 'hover_tracker', 'not_hover_tracker')
+    
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, False)
 
-_hover_tracker_dict = {}
-_not_hover_tracker_dict = {}
+_click_states: OrderedDict = OrderedDict()
+
+def get_click_state(key) -> ClickState:
+    state = _click_states.get(key)
+    if state is None:
+        state = ClickState()
+        _click_states[key] = state
+        if len(_click_states) > CLICK_STATE_CACHE_SIZE:
+            _click_states.popitem(last=False)
+    else:
+        _click_states.move_to_end(key)
+    return state
 
 def is_clicked(mouse_rect: pygame.Rect,
                target: pygame.Rect | tuple[float, float],
@@ -74,131 +108,99 @@ def is_clicked(mouse_rect: pygame.Rect,
                right_many_actions_one_click: bool = False,
                right_many_actions_one_not_click: bool = False,
                hover_many_actions_one_click: bool = False,
-               not_hover_many_actions_one_click: bool = False):
-
-    global _left_mouse_clicked_dict, _left_mouse_clicked_outside_dict, _middle_mouse_clicked_dict, _middle_mouse_clicked_outside_dict, _right_mouse_clicked_dict, _right_mouse_clicked_outside_dict, _left_mouse_tracker_clicked_dict, _left_mouse_tracker_not_clicked_dict, _middle_mouse_tracker_clicked_dict, _middle_mouse_tracker_not_clicked_dict, _right_mouse_tracker_clicked_dict, _right_mouse_tracker_not_clicked_dict, _hover_tracker_dict, _not_hover_tracker_dict
-
-    left_mouse_clicked, middle_mouse_clicked, right_mouse_clicked = pygame.mouse.get_pressed()
+               not_hover_many_actions_one_click: bool = False,
+               state: ClickState = None):
+    
+    left_mouse_clicked, middle_mouse_clicked, right_mouse_clicked = get_mouse_pressed()
     if isinstance(target, tuple):
         mouse_collission = mouse_rect.clipline(target)
     else:
         mouse_collission = mouse_rect.colliderect(target)
-    
-    target_rect_key = repr(target)
-    
-    if target_rect_key not in _left_mouse_clicked_dict:
-        _left_mouse_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _left_mouse_clicked_outside_dict:
-        _left_mouse_clicked_outside_dict[target_rect_key] = False
-    if target_rect_key not in _middle_mouse_clicked_dict:
-        _middle_mouse_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _middle_mouse_clicked_outside_dict:
-        _middle_mouse_clicked_outside_dict[target_rect_key] = False
-    if target_rect_key not in _right_mouse_clicked_dict:
-        _right_mouse_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _right_mouse_clicked_outside_dict:
-        _right_mouse_clicked_outside_dict[target_rect_key] = False
-    
-    if target_rect_key not in _left_mouse_tracker_clicked_dict:
-        _left_mouse_tracker_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _left_mouse_tracker_not_clicked_dict:
-        _left_mouse_tracker_not_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _middle_mouse_tracker_clicked_dict:
-        _middle_mouse_tracker_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _middle_mouse_tracker_not_clicked_dict:
-        _middle_mouse_tracker_not_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _right_mouse_tracker_clicked_dict:
-        _right_mouse_tracker_clicked_dict[target_rect_key] = False
-    if target_rect_key not in _right_mouse_tracker_not_clicked_dict:
-        _right_mouse_tracker_not_clicked_dict[target_rect_key] = False
-    
-    if target_rect_key not in _hover_tracker_dict:
-        _hover_tracker_dict[target_rect_key] = False
-    if target_rect_key not in _not_hover_tracker_dict:
-        _not_hover_tracker_dict[target_rect_key] = False
+    if state is None:
+        state = get_click_state(target if isinstance(target, tuple) else tuple(target))
     
     if mouse_collission:
-        _not_hover_tracker_dict[target_rect_key] = False
-        if not _hover_tracker_dict[target_rect_key] or hover_many_actions_one_click:
+        state.not_hover_tracker = False
+        if not state.hover_tracker or hover_many_actions_one_click:
             if hover_func is not None:
                 hover_func()
-            _hover_tracker_dict[target_rect_key] = True
+            state.hover_tracker = True
     else:
-        _hover_tracker_dict[target_rect_key] = False
-        if not _not_hover_tracker_dict[target_rect_key] or not_hover_many_actions_one_click:
+        state.hover_tracker = False
+        if not state.not_hover_tracker or not_hover_many_actions_one_click:
             if not_hover_func is not None:
                 not_hover_func()
-            _not_hover_tracker_dict[target_rect_key] = True
+            state.not_hover_tracker = True
     
     if left_mouse_clicked and mouse_collission:
-        _left_mouse_clicked_dict[target_rect_key] = True
+        state.left_clicked = True
     if not left_mouse_clicked:
-        _left_mouse_clicked_dict[target_rect_key] = False
-    if not _left_mouse_clicked_dict[target_rect_key] and not mouse_collission:
-        _left_mouse_clicked_outside_dict[target_rect_key] = False
+        state.left_clicked = False
+    if not state.left_clicked and not mouse_collission:
+        state.left_clicked_outside = False
     if not left_mouse_clicked:
-        _left_mouse_clicked_outside_dict[target_rect_key] = True
+        state.left_clicked_outside = True
     
     if middle_mouse_clicked and mouse_collission:
-        _middle_mouse_clicked_dict[target_rect_key] = True
+        state.middle_clicked = True
     if not middle_mouse_clicked:
-        _middle_mouse_clicked_dict[target_rect_key] = False
-    if not _middle_mouse_clicked_dict[target_rect_key] and not mouse_collission:
-        _middle_mouse_clicked_outside_dict[target_rect_key] = False
+        state.middle_clicked = False
+    if not state.middle_clicked and not mouse_collission:
+        state.middle_clicked_outside = False
     if not middle_mouse_clicked:
-        _middle_mouse_clicked_outside_dict[target_rect_key] = True
+        state.middle_clicked_outside = True
     
     if right_mouse_clicked and mouse_collission:
-        _right_mouse_clicked_dict[target_rect_key] = True
+        state.right_clicked = True
     if not right_mouse_clicked:
-        _right_mouse_clicked_dict[target_rect_key] = False
-    if not _right_mouse_clicked_dict[target_rect_key] and not mouse_collission:
-        _right_mouse_clicked_outside_dict[target_rect_key] = False
+        state.right_clicked = False
+    if not state.right_clicked and not mouse_collission:
+        state.right_clicked_outside = False
     if not right_mouse_clicked:
-        _right_mouse_clicked_outside_dict[target_rect_key] = True
+        state.right_clicked_outside = True
     
-    left_mouse_clicked = _left_mouse_clicked_dict[target_rect_key] and _left_mouse_clicked_outside_dict[target_rect_key]
-    middle_mouse_clicked = _middle_mouse_clicked_dict[target_rect_key] and _middle_mouse_clicked_outside_dict[target_rect_key]
-    right_mouse_clicked = _right_mouse_clicked_dict[target_rect_key] and _right_mouse_clicked_outside_dict[target_rect_key]
+    left_mouse_clicked = state.left_clicked and state.left_clicked_outside
+    middle_mouse_clicked = state.middle_clicked and state.middle_clicked_outside
+    right_mouse_clicked = state.right_clicked and state.right_clicked_outside
     
     if left_mouse_clicked:
-        _left_mouse_tracker_not_clicked_dict[target_rect_key] = False
-        if not _left_mouse_tracker_clicked_dict[target_rect_key] or left_many_actions_one_click:
+        state.left_tracker_not_clicked = False
+        if not state.left_tracker_clicked or left_many_actions_one_click:
             if on_left_clicked_func is not None:
                 on_left_clicked_func()
-            _left_mouse_tracker_clicked_dict[target_rect_key] = True
+            state.left_tracker_clicked = True
     else:
-        _left_mouse_tracker_clicked_dict[target_rect_key] = False
-        if not _left_mouse_tracker_not_clicked_dict[target_rect_key] or left_many_actions_one_not_click:
+        state.left_tracker_clicked = False
+        if not state.left_tracker_not_clicked or left_many_actions_one_not_click:
             if on_not_left_clicked_func is not None:
                 on_not_left_clicked_func()
-            _left_mouse_tracker_not_clicked_dict[target_rect_key] = True
+            state.left_tracker_not_clicked = True
     
     if middle_mouse_clicked:
-        _middle_mouse_tracker_not_clicked_dict[target_rect_key] = False
-        if not _middle_mouse_tracker_clicked_dict[target_rect_key] or middle_many_actions_one_click:
+        state.middle_tracker_not_clicked = False
+        if not state.middle_tracker_clicked or middle_many_actions_one_click:
             if on_middle_clicked_func is not None:
                 on_middle_clicked_func()
-            _middle_mouse_tracker_clicked_dict[target_rect_key] = True
+            state.middle_tracker_clicked = True
     else:
-        _middle_mouse_tracker_clicked_dict[target_rect_key] = False
-        if not _middle_mouse_tracker_not_clicked_dict[target_rect_key] or middle_many_actions_one_not_click:
+        state.middle_tracker_clicked = False
+        if not state.middle_tracker_not_clicked or middle_many_actions_one_not_click:
             if on_not_middle_clicked_func is not None:
                 on_not_middle_clicked_func()
-            _middle_mouse_tracker_not_clicked_dict[target_rect_key] = True
+            state.middle_tracker_not_clicked = True
     
     if right_mouse_clicked:
-        _right_mouse_tracker_not_clicked_dict[target_rect_key] = False
-        if not _right_mouse_tracker_clicked_dict[target_rect_key] or right_many_actions_one_click:
+        state.right_tracker_not_clicked = False
+        if not state.right_tracker_clicked or right_many_actions_one_click:
             if on_right_clicked_func is not None:
                 on_right_clicked_func()
-            _right_mouse_tracker_clicked_dict[target_rect_key] = True
+            state.right_tracker_clicked = True
     else:
-        _right_mouse_tracker_clicked_dict[target_rect_key] = False
-        if not _right_mouse_tracker_not_clicked_dict[target_rect_key] or right_many_actions_one_not_click:
+        state.right_tracker_clicked = False
+        if not state.right_tracker_not_clicked or right_many_actions_one_not_click:
             if on_not_right_clicked_func is not None:
                 on_not_right_clicked_func()
-            _right_mouse_tracker_not_clicked_dict[target_rect_key] = True
+            state.right_tracker_not_clicked = True
     
     return left_mouse_clicked, middle_mouse_clicked, right_mouse_clicked, mouse_collission
 
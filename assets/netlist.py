@@ -0,0 +1,237 @@
+from typing import Callable
+
+CONST_NET = 0
+
+PRIMITIVE_KINDS = {
+    '#functionAnd': 'And',
+    '#functionNot': 'Not',
+    '#functionTimer': 'Timer',
+}
+
+class GateRecord:
+    __slots__ = ('kind', 'inputs', 'outputs', 'netlist', 'source_index')
+    
+    def __init__(self, kind: str, inputs: tuple, outputs: tuple, netlist: 'Netlist' = None, source_index: int = None) -> None:
+        self.kind = kind
+        self.inputs = inputs
+        self.outputs = outputs
+        self.netlist = netlist
+        self.source_index = source_index
+
+class Netlist:
+    def __init__(self, name: str, net_count: int, input_nets: tuple, output_nets: tuple, gates: list[GateRecord], node_nets: tuple = (), wire_nets: tuple = (), analysis: tuple = None) -> None:
+        self.name = name
+        self.net_count = net_count
+        self.input_nets = input_nets
+        self.output_nets = output_nets
+        self.gates = gates
+        self.node_nets = node_nets
+        self.wire_nets = wire_nets
+        
+        self.volatile_gates = [index for index, record in enumerate(self.gates) if record.kind == 'Timer' or (record.kind == 'Custom' and record.netlist.has_timer)]
+        self.has_timer = bool(self.volatile_gates)
+        
+        if analysis is not None:
+            self.fanout, self.components, self.ranks, self.levels, self.feedback_components = analysis
+            self.has_feedback = bool(self.feedback_components) or any(record.kind == 'Custom' and record.netlist.has_feedback for record in self.gates)
+            return
+        
+        self.fanout = [[] for _ in range(self.net_count)]
+        for index, record in enumerate(self.gates):
+            for net in set(record.inputs):
+                self.fanout[net].append(index)
+        
+        self._levelize()
+    
+    def _levelize(self):
+        drivers = {}
+        for index, record in enumerate(self.gates):
+            for net in record.outputs:
+                drivers[net] = index
+        
+        successors = []
+        for record in self.gates:
+            gate_successors = set()
+            for net in record.outputs:
+                gate_successors.update(self.fanout[net])
+            successors.append(sorted(gate_successors))
+        
+        self.components = _get_strongly_connected_components(successors)[::-1]
+        self.ranks = [0] * len(self.gates)
+        self.levels = [0] * len(self.gates)
+        self.feedback_components = []
+        
+        for rank, component in enumerate(self.components):
+            level = 0
+            for index in component:
+                self.ranks[index] = rank
+                for net in self.gates[index].inputs:
+                    driver = drivers.get(net)
+                    if driver is not None and self.ranks[driver] < rank:
+                        level = max(level, self.levels[driver] + 1)
+            
+            for index in component:
+                self.levels[index] = level
+            
+            if len(component) > 1 or component[0] in successors[component[0]]:
+                self.feedback_components.append(rank)
+        
+        self.has_feedback = bool(self.feedback_components) or any(record.kind == 'Custom' and record.netlist.has_feedback for record in self.gates)
+
+def _get_strongly_connected_components(successors: list[list[int]]):
+    counter = 0
+    indices = [-1] * len(successors)
+    lowlinks = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack = []
+    components = []
+    
+    for root in range(len(successors)):
+        if indices[root] != -1:
+            continue
+        
+        work = [(root, 0)]
+        while work:
+            vertex, successor_index = work[-1]
+            if successor_index == 0:
+                indices[vertex] = lowlinks[vertex] = counter
+                counter += 1
+                stack.append(vertex)
+                on_stack[vertex] = True
+            
+            for i in range(successor_index, len(successors[vertex])):
+                successor = successors[vertex][i]
+                if indices[successor] == -1:
+                    work[-1] = (vertex, i + 1)
+                    work.append((successor, 0))
+                    break
+                elif on_stack[successor]:
+                    lowlinks[vertex] = min(lowlinks[vertex], indices[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[vertex])
+                
+                if lowlinks[vertex] == indices[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(sorted(component))
+    
+    return components
+
+def _get_circuit_dict(circuit) -> dict:
+    if isinstance(circuit, dict):
+        return circuit
+    return circuit.get_dict()
+
+def compile_circuit(circuit, compile_child: Callable[[dict], Netlist] = None) -> Netlist:
+    d = _get_circuit_dict(circuit)
+    if compile_child is None:
+        compile_child = compile_circuit
+    
+    input_amt = len(d['input_node_objects'])
+    output_amt = len(d['output_node_objects'])
+    
+    node_is_driver = [True] * input_amt
+    for gate_info in d['gates']:
+        node_is_driver += [False] * gate_info['input_amt'] + [True] * gate_info['output_amt']
+    node_is_driver += [False] * output_amt
+    
+    net_count = 1
+    node_nets = [CONST_NET] * len(node_is_driver)
+    for node_index, is_driver in enumerate(node_is_driver):
+        if is_driver:
+            node_nets[node_index] = net_count
+            net_count += 1
+    
+    sink_drivers = {}
+    wire_nets = []
+    for wire_nodes in d['wire_connected_indexes']:
+        drivers = [node_index for node_index in wire_nodes if node_is_driver[node_index]]
+        sinks = [node_index for node_index in wire_nodes if not node_is_driver[node_index]]
+        
+        wire_net = node_nets[drivers[0]] if drivers else CONST_NET
+        wire_nets.append(wire_net)
+        
+        if wire_net != CONST_NET:
+            for node_index in sinks:
+                sink_drivers.setdefault(node_index, [])
+                if wire_net not in sink_drivers[node_index]:
+                    sink_drivers[node_index].append(wire_net)
+    
+    wired_or_gates = []
+    for node_index, drivers in sink_drivers.items():
+        if len(drivers) == 1:
+            node_nets[node_index] = drivers[0]
+        else:
+            node_nets[node_index] = net_count
+            wired_or_gates.append(GateRecord('Or', tuple(drivers), (net_count,)))
+            net_count += 1
+    
+    gates = []
+    node_index = input_amt
+    for gate_index, gate_info in enumerate(d['gates']):
+        inputs = tuple(node_nets[node_index:node_index + gate_info['input_amt']])
+        node_index += gate_info['input_amt']
+        outputs = tuple(node_nets[node_index:node_index + gate_info['output_amt']])
+        node_index += gate_info['output_amt']
+        
+        logic = gate_info['logic_func_or_circuit_or_circuit_dict']
+        if isinstance(logic, dict):
+            gates.append(GateRecord('Custom', inputs, outputs, compile_child(logic), gate_index))
+        elif logic in PRIMITIVE_KINDS:
+            gates.append(GateRecord(PRIMITIVE_KINDS[logic], inputs, outputs, None, gate_index))
+        else:
+            raise ValueError(f'Gate "{gate_info["name"]}" has no compilable logic: {logic!r}')
+    
+    return Netlist(d['name'],
+                   net_count,
+                   tuple(node_nets[:input_amt]),
+                   tuple(node_nets[len(node_nets) - output_amt:]),
+                   gates + wired_or_gates,
+                   tuple(node_nets),
+                   tuple(wire_nets))
+
+def flatten_netlist(netlist: Netlist) -> Netlist:
+    if not any(record.kind == 'Custom' for record in netlist.gates):
+        return netlist
+    
+    net_count = netlist.net_count
+    gates = []
+    for record in netlist.gates:
+        if record.kind != 'Custom':
+            gates.append(record)
+            continue
+        
+        child = flatten_netlist(record.netlist)
+        net_map = {CONST_NET: CONST_NET}
+        net_map.update(zip(child.input_nets, record.inputs))
+        
+        buffered_outputs = []
+        for child_net, net in zip(child.output_nets, record.outputs):
+            if child_net in net_map:
+                buffered_outputs.append((child_net, net))
+            else:
+                net_map[child_net] = net
+        
+        for child_net in range(child.net_count):
+            if child_net not in net_map:
+                net_map[child_net] = net_count
+                net_count += 1
+        
+        for child_record in child.gates:
+            gates.append(GateRecord(child_record.kind,
+                                    tuple(net_map[net] for net in child_record.inputs),
+                                    tuple(net_map[net] for net in child_record.outputs),
+                                    None,
+                                    record.source_index))
+        for child_net, net in buffered_outputs:
+            gates.append(GateRecord('Or', (net_map[child_net],), (net,), None, record.source_index))
+    
+    return Netlist(netlist.name, net_count, netlist.input_nets, netlist.output_nets, gates, netlist.node_nets, netlist.wire_nets)
@@ -0,0 +1,248 @@
+import os
+import mmap
+import struct
+import threading
+from collections import OrderedDict
+from array import array
+from assets.netlist import Netlist, GateRecord
+
+NETLIST_CACHE_MAGIC = b'IFLN'
+NETLIST_CACHE_VERSION = 1
+NETLIST_CACHE_SUFFIX = '.netcache'
+NETLIST_LIBRARY_SUFFIX = '.net'
+
+OPCODES = {'And': 0, 'Not': 1, 'Or': 2, 'Timer': 3}
+KINDS = {opcode: kind for kind, opcode in OPCODES.items()}
+
+_HEADER = struct.Struct('<4sHHI')
+_ENTRY = struct.Struct('<20sQQ')
+_NETLIST_HEADER = struct.Struct('<13i')
+
+def _get_offsets(sequences):
+    offsets = [0]
+    for sequence in sequences:
+        offsets.append(offsets[-1] + len(sequence))
+    return offsets
+
+def _flatten(sequences):
+    return [value for sequence in sequences for value in sequence]
+
+def is_cacheable(netlist: Netlist):
+    return all(record.kind in OPCODES for record in netlist.gates)
+
+def pack_netlist(netlist: Netlist) -> bytes:
+    gates = netlist.gates
+    name = netlist.name.encode()
+    sections = [
+        netlist.input_nets,
+        netlist.output_nets,
+        [OPCODES[record.kind] for record in gates],
+        [-1 if record.source_index is None else record.source_index for record in gates],
+        _get_offsets(record.inputs for record in gates),
+        _flatten(record.inputs for record in gates),
+        _get_offsets(record.outputs for record in gates),
+        _flatten(record.outputs for record in gates),
+        netlist.ranks,
+        netlist.levels,
+        _get_offsets(netlist.components),
+        _flatten(netlist.components),
+        netlist.feedback_components,
+        _get_offsets(netlist.fanout),
+        _flatten(netlist.fanout),
+        netlist.node_nets,
+        netlist.wire_nets,
+    ]
+    
+    header = _NETLIST_HEADER.pack(netlist.net_count,
+                                  len(netlist.input_nets),
+                                  len(netlist.output_nets),
+                                  len(gates),
+                                  len(sections[5]),
+                                  len(sections[7]),
+                                  len(netlist.components),
+                                  len(netlist.feedback_components),
+                                  len(sections[14]),
+                                  len(netlist.node_nets),
+                                  len(netlist.wire_nets),
+                                  len(name),
+                                  0)
+    return header + b''.join(array('i', section).tobytes() for section in sections) + name
+
+def unpack_netlist(data: memoryview) -> Netlist:
+    net_count, input_amt, output_amt, gate_amt, input_pin_amt, output_pin_amt, component_amt, feedback_amt, fanout_amt, node_amt, wire_amt, name_length, _ = _NETLIST_HEADER.unpack_from(data, 0)
+    ints = data[_NETLIST_HEADER.size:len(data) - name_length].cast('i')
+    name = bytes(data[len(data) - name_length:]).decode()
+    
+    position = 0
+    def take(amount):
+        nonlocal position
+        position += amount
+        return ints[position - amount:position]
+    
+    input_nets = take(input_amt)
+    output_nets = take(output_amt)
+    opcodes = take(gate_amt)
+    source_indexes = take(gate_amt)
+    input_offsets = take(gate_amt + 1)
+    inputs = take(input_pin_amt)
+    output_offsets = take(gate_amt + 1)
+    outputs = take(output_pin_amt)
+    ranks = take(gate_amt)
+    levels = take(gate_amt)
+    component_offsets = take(component_amt + 1)
+    component_members = take(gate_amt)
+    feedback_components = take(feedback_amt)
+    fanout_offsets = take(net_count + 1)
+    fanout = take(fanout_amt)
+    node_nets = take(node_amt)
+    wire_nets = take(wire_amt)
+    
+    gates = [GateRecord(KINDS[opcodes[index]],
+                        inputs[input_offsets[index]:input_offsets[index + 1]],
+                        outputs[output_offsets[index]:output_offsets[index + 1]],
+                        None,
+                        None if source_indexes[index] == -1 else source_indexes[index]) for index in range(gate_amt)]
+    
+    analysis = ([fanout[fanout_offsets[net]:fanout_offsets[net + 1]] for net in range(net_count)],
+                [component_members[component_offsets[index]:component_offsets[index + 1]] for index in range(component_amt)],
+                ranks,
+                levels,
+                feedback_components)
+    return Netlist(name, net_count, input_nets, output_nets, gates, node_nets, wire_nets, analysis)
+
+class NetlistCache:
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.entries = {}
+        self.netlists = {}
+        self.data = None
+        
+        try:
+            with open(self.file_path, 'rb') as file:
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+        
+        if len(self.data) < _HEADER.size:
+            return
+        magic, version, _, count = _HEADER.unpack_from(self.data, 0)
+        if magic != NETLIST_CACHE_MAGIC or version != NETLIST_CACHE_VERSION or len(self.data) < _HEADER.size + count * _ENTRY.size:
+            return
+        
+        for index in range(count):
+            digest, offset, size = _ENTRY.unpack_from(self.data, _HEADER.size + index * _ENTRY.size)
+            if offset + size <= len(self.data):
+                self.entries[digest.hex()] = offset, size
+    
+    def get(self, key: str) -> Netlist | None:
+        netlist = self.netlists.get(key)
+        if netlist is None and key in self.entries:
+            offset, size = self.entries[key]
+            netlist = unpack_netlist(memoryview(self.data)[offset:offset + size])
+            self.netlists[key] = netlist
+        return netlist
+    
+    def __contains__(self, key: str):
+        return key in self.entries
+
+def write_netlist_cache(file_path: str, netlists: dict[str, Netlist]):
+    netlists = {key: netlist for key, netlist in netlists.items() if is_cacheable(netlist)}
+    payloads = [pack_netlist(netlist) for netlist in netlists.values()]
+    
+    offset = _HEADER.size + len(payloads) * _ENTRY.size
+    entries = []
+    for key, payload in zip(netlists, payloads):
+        entries.append(_ENTRY.pack(bytes.fromhex(key), offset, len(payload)))
+        offset += len(payload) + (-len(payload) % 8)
+    
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(_HEADER.pack(NETLIST_CACHE_MAGIC, NETLIST_CACHE_VERSION, 0, len(payloads)))
+        file.write(b''.join(entries))
+        for payload in payloads:
+            file.write(payload + bytes(-len(payload) % 8))
+        file.flush()
+        os.fsync(file.fileno())
+    
+    try:
+        os.replace(temp_path, file_path)
+    except OSError:
+        os.remove(temp_path)
+
+class NetlistLibrary:
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.netlists = {}
+        self.size = 0
+        self.lock = threading.Lock()
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            files = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(NETLIST_LIBRARY_SUFFIX)), key=lambda entry: entry.stat().st_mtime)
+        except OSError:
+            files = []
+        
+        for entry in files:
+            self.entries[entry.name[:-len(NETLIST_LIBRARY_SUFFIX)]] = entry.stat().st_size
+            self.size += entry.stat().st_size
+    
+    def _get_path(self, key: str):
+        return os.path.join(self.directory, key + NETLIST_LIBRARY_SUFFIX)
+    
+    def get(self, key: str) -> Netlist | None:
+        with self.lock:
+            netlist = self.netlists.get(key)
+            if netlist is not None or key not in self.entries:
+                return netlist
+            
+            try:
+                with open(self._get_path(key), 'rb') as file:
+                    data = file.read()
+                os.utime(self._get_path(key))
+            except OSError:
+                return None
+            
+            if len(data) < _HEADER.size or _HEADER.unpack_from(data, 0)[:2] != (NETLIST_CACHE_MAGIC, NETLIST_CACHE_VERSION):
+                return None
+            
+            self.entries.move_to_end(key)
+            netlist = unpack_netlist(memoryview(data)[_HEADER.size:])
+            self.netlists[key] = netlist
+            return netlist
+    
+    def __contains__(self, key: str):
+        return key in self.entries
+    
+    def store(self, netlists: dict[str, Netlist]):
+        for key, netlist in netlists.items():
+            if key in self.entries or not is_cacheable(netlist):
+                continue
+            
+            data = _HEADER.pack(NETLIST_CACHE_MAGIC, NETLIST_CACHE_VERSION, 0, 1) + pack_netlist(netlist)
+            if len(data) > self.max_size:
+                continue
+            
+            temp_path = self._get_path(key) + '.tmp'
+            try:
+                with open(temp_path, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_path, self._get_path(key))
+            except OSError:
+                continue
+            
+            with self.lock:
+                self.entries[key] = len(data)
+                self.size += len(data)
+                self._evict()
+    
+    def _evict(self):
+        while self.size > self.max_size and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.size -= size
+            self.netlists.pop(key, None)
+            try:
+                os.remove(self._get_path(key))
+            except OSError:
+                pass
@@ -0,0 +1,111 @@
+import time
+from typing import Callable
+from assets.netlist import Netlist
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class NumpyBatchSimulator:
+    def __init__(self, netlist: Netlist, clock: Callable[[], float] = time.time, chunk_size: int = 1 << 16) -> None:
+        if numpy is None:
+            raise ImportError('NumpyBatchSimulator needs numpy, install it with "pip install numpy"')
+        
+        self.netlist = netlist
+        self.clock = clock
+        self.chunk_size = chunk_size
+        self.children = {index: NumpyBatchSimulator(record.netlist, self.clock, self.chunk_size) for index, record in enumerate(self.netlist.gates) if record.kind == 'Custom'}
+        self.input_nets = numpy.array(self.netlist.input_nets, dtype=numpy.intp)
+        self.output_nets = numpy.array(self.netlist.output_nets, dtype=numpy.intp)
+        self.steps = self._compile_steps()
+    
+    def _compile_steps(self):
+        feedback_components = set(self.netlist.feedback_components)
+        levels = {}
+        for rank, component in enumerate(self.netlist.components):
+            groups, singles, feedbacks = levels.setdefault(self.netlist.levels[component[0]], ({}, [], []))
+            record = self.netlist.gates[component[0]]
+            if rank in feedback_components:
+                feedbacks.append(component)
+            elif record.kind in ('And', 'Not', 'Or'):
+                groups.setdefault((record.kind, len(record.inputs)), []).append(component[0])
+            else:
+                singles.append(component[0])
+        
+        steps = []
+        for level in sorted(levels):
+            groups, singles, feedbacks = levels[level]
+            for (kind, _), indices in groups.items():
+                inputs = numpy.array([self.netlist.gates[index].inputs for index in indices], dtype=numpy.intp).T
+                outputs = numpy.array([self.netlist.gates[index].outputs[0] for index in indices], dtype=numpy.intp)
+                steps.append(('group', kind, inputs, outputs))
+            for index in singles:
+                steps.append(('gate', index))
+            for component in feedbacks:
+                steps.append(('feedback', component))
+        
+        return steps
+    
+    def _evaluate_group(self, states, kind: str, inputs, outputs):
+        match kind:
+            case 'And':
+                states[outputs] = states[inputs[0]] & states[inputs[1]]
+            case 'Not':
+                states[outputs] = ~states[inputs[0]]
+            case 'Or':
+                states[outputs] = numpy.logical_or.reduce(states[inputs], axis=0)
+    
+    def _evaluate_gate(self, states, index: int):
+        record = self.netlist.gates[index]
+        inputs = list(record.inputs)
+        outputs = list(record.outputs)
+        match record.kind:
+            case 'And':
+                states[outputs[0]] = states[inputs[0]] & states[inputs[1]]
+            case 'Not':
+                states[outputs[0]] = ~states[inputs[0]]
+            case 'Or':
+                states[outputs[0]] = numpy.logical_or.reduce(states[inputs], axis=0)
+            case 'Timer':
+                states[outputs[0]] = bool(int(self.clock()) % 2)
+            case 'Custom':
+                states[outputs] = self.children[index]._evaluate_rows(states[inputs])
+    
+    def _evaluate_feedback(self, states, component: list[int]):
+        outputs = [net for index in component for net in self.netlist.gates[index].outputs]
+        for _ in range((len(component) + 1) * 2):
+            previous = states[outputs].copy()
+            for index in component:
+                self._evaluate_gate(states, index)
+            if numpy.array_equal(previous, states[outputs]):
+                break
+    
+    def _evaluate_rows(self, input_rows):
+        states = numpy.zeros((self.netlist.net_count, input_rows.shape[1]), dtype=bool)
+        states[self.input_nets] = input_rows
+        
+        for step in self.steps:
+            match step[0]:
+                case 'group':
+                    self._evaluate_group(states, *step[1:])
+                case 'gate':
+                    self._evaluate_gate(states, step[1])
+                case 'feedback':
+                    self._evaluate_feedback(states, step[1])
+        
+        return states[self.output_nets]
+    
+    def evaluate(self, input_matrix):
+        input_matrix = numpy.asarray(input_matrix, dtype=bool)
+        if self.netlist.input_nets:
+            input_matrix = input_matrix.reshape(-1, len(self.netlist.input_nets))
+        else:
+            input_matrix = input_matrix.reshape(input_matrix.shape[0] if input_matrix.ndim > 1 else 1, 0)
+        output_matrix = numpy.empty((input_matrix.shape[0], len(self.netlist.output_nets)), dtype=numpy.uint8)
+        
+        for start in range(0, input_matrix.shape[0], self.chunk_size):
+            chunk = input_matrix[start:start + self.chunk_size]
+            output_matrix[start:start + chunk.shape[0]] = self._evaluate_rows(chunk.T).T
+        
+        return output_matrix
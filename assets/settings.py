@@ -1,19 +1,36 @@
 
+import os
 from typing import Final
 
 SCR_WIDTH: Final = 1200
 SCR_HEIGHT: Final = 600
 FPS: Final = 60
+IDLE_FRAME_THRESHOLD = 3
 
 GATE_WIDTH = 100
 NODE_SIZE = 10
 NODE_SPACING = 20
 
 GRID_SIZE = 1
+SPATIAL_CELL_SIZE = 64
+VIEWPORT_CULL_MARGIN = 16
+GATE_SPRITE_CACHE_SIZE = 1024
+TEXT_SURFACE_CACHE_SIZE = 1024
+CLICK_STATE_CACHE_SIZE = 4096
 
 GATE_TEXT_BORDER_OFFSET_X = 20
 GATE_TEXT_BORDER_OFFSET_Y = 5
 
+USE_GENERATED_LOGIC = True
+TRUTH_TABLE_MAX_INPUTS = 12
+TRUTH_TABLE_CACHE_SIZE = 4096
+
+AUTOSAVE_INTERVAL = 30
+AUTOSAVE_STATUS_TIME = 2
+
+DEFINITION_LIBRARY_PATH = os.path.join(os.path.expanduser('~'), '.ifes_logic_gates', 'definitions')
+DEFINITION_LIBRARY_MAX_SIZE = 64 * 1024 * 1024
+
 DEFAULT_CIRCUIT_NAME = '_'
 APP_NAME ='IFEs Logic Gate Simulator'
 
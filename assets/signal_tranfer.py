@@ -3,7 +3,8 @@ from copy import deepcopy
 from typing import Callable
 from assets.settings import *
 from assets.widgets import Button
-from assets.modules import is_clicked, set_color
+from assets.modules import ClickState, is_clicked, set_color
+from assets.input_state import get_mouse_pos
 
 class SignalTransporter:
     def __init__(self, screen, color_on, color_off) -> None:
@@ -202,13 +203,7 @@ class Node(SignalTransporter):
     def update(self):
         super().update()
         
-        if self.is_input:
-            self.set_state(max([wire.get_state() for wire in self.connected_inputs] if self.connected_inputs else [self.state]))
-        if self.is_output:
-            for wire in self.connected_outputs:
-                wire.set_state(self.get_state())
-        
-        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_pos = get_mouse_pos()
 
 class Wire(SignalTransporter):
     def __init__(self, screen: pygame.Surface, init_starting_pos: list, init_ending_pos: list, width: int, color_on, color_off, delete_func: Callable[[SignalTransporter], None]) -> None:
@@ -217,14 +212,14 @@ class Wire(SignalTransporter):
         self.wire_move_buttons = []
         self.delete_func = delete_func
         self.curr_color = self.color_on if self.state else self.color_off
-
+        
         self.first_pos_tracker = [init_starting_pos, init_ending_pos]
         self.breakpoints = [self.first_pos_tracker]
         
         self.starting_point = self.breakpoints[0][0]
         self.ending_point = self.breakpoints[-1][1]
-                
-        self.mouse_pos = pygame.mouse.get_pos()
+        
+        self.mouse_pos = get_mouse_pos()
         self.grid_mouse_pos = tuple(list((i - (i % GRID_SIZE)) for i in self.mouse_pos))
         
         self.input_node = None
@@ -232,18 +227,23 @@ class Wire(SignalTransporter):
         
         self.input_connected = False
         self.output_connected = False
+        
+        self.version = 0
+        self.on_modified_func = None
+        self.on_moved_func = None
+        self.click_states = {}
     
     def get_dict(self):
         return {
-            'breakpoints': self.breakpoints,
-            'first_pos_tracker': self.first_pos_tracker,
+            'breakpoints': deepcopy(self.breakpoints),
+            'first_pos_tracker': deepcopy(self.first_pos_tracker),
             'width': self.width,
             'color_on': self.color_on,
             'color_off': self.color_off,
         }
     
     def set_dict(self, d: dict):
-        self.breakpoints = [d['first_pos_tracker']]
+        self.breakpoints = [deepcopy(d['first_pos_tracker'])]
         self.wire_move_buttons.clear()
         b_p = d['breakpoints']
         for _, end in b_p:
@@ -277,6 +277,23 @@ class Wire(SignalTransporter):
         delete_func = kwargs.get('delete_func')
         if delete_func is not None:
             self.delete_func = delete_func
+        
+        on_modified_func = kwargs.get('on_modified_func')
+        if on_modified_func is not None:
+            self.on_modified_func = on_modified_func
+        
+        on_moved_func = kwargs.get('on_moved_func')
+        if on_moved_func is not None:
+            self.on_moved_func = on_moved_func
+    
+    def _mark_modified(self):
+        self.version += 1
+        if self.on_modified_func is not None:
+            self.on_modified_func()
+    
+    def _mark_moved(self):
+        if self.on_moved_func is not None:
+            self.on_moved_func()
     
     def get_move_buttons(self):
         return [button for _, button in self.wire_move_buttons]
@@ -308,12 +325,16 @@ class Wire(SignalTransporter):
     
     def move_breakpoint_starting_point(self, index: int, pos: list):
         index = len(self.breakpoints) - 1 if index == -1 else index
+        if tuple(self.breakpoints[index][0]) != tuple(pos):
+            self._mark_modified()
         self.breakpoints[index][0] = pos
         if index > 0:
             self.breakpoints[index - 1][1] = pos
     
     def move_breakpoint_ending_point(self, index: int, pos: list):
         index = len(self.breakpoints) - 1 if index == -1 else index
+        if tuple(self.breakpoints[index][1]) != tuple(pos):
+            self._mark_modified()
         self.breakpoints[index][1] = pos
         if index != len(self.breakpoints) - 1:
             self.breakpoints[index + 1][0] = pos
@@ -334,6 +355,7 @@ class Wire(SignalTransporter):
                 self.wire_move_buttons[i][1].configure(on_right_mouse_button_clicked=self.remove_breakpoint(i), on_left_mouse_button_clicked=self._move_breakpoint(i, button))
             
             self.breakpoints.pop(index)
+            self._mark_modified()
         
         return func
     
@@ -347,6 +369,7 @@ class Wire(SignalTransporter):
             self.breakpoints.insert(0, pos)
             
             self._add_breakpoint_buttons(self.breakpoints.index(pos))
+        self._mark_modified()
     
     def connected_to(self, node: Node):
         if node.is_input:
@@ -385,20 +408,26 @@ class Wire(SignalTransporter):
                 else:
                     self.breakpoints.insert(0, [tuple(prev_starting_pos), self.grid_mouse_pos])
                     self.breakpoints[1][0] = self.grid_mouse_pos
+                self._mark_modified()
     
     def draw(self):
         mouse_rect = pygame.Rect(0, 0, 8, 8)
         mouse_rect.center = self.grid_mouse_pos
         
+        click_states = {}
         for starting_point, stopping_point in self.breakpoints:
             line_pos = (tuple(starting_point), tuple(stopping_point))
+            state = self.click_states.get(line_pos)
+            click_states[line_pos] = state if state is not None else ClickState()
             
             is_clicked(mouse_rect,
                        line_pos,
                        on_middle_clicked_func=lambda: self.break_line((starting_point, stopping_point)),
-                       on_right_clicked_func=lambda: self.delete_func(self))
+                       on_right_clicked_func=lambda: self.delete_func(self),
+                       state=click_states[line_pos])
             if self.render:
                 pygame.draw.line(self.screen, self.curr_color, starting_point, stopping_point, self.width)
+        self.click_states = click_states
     
     def update(self):
         self.curr_color = self.color_on if self.state else self.color_off
@@ -411,11 +440,13 @@ class Wire(SignalTransporter):
             button.configure(bg_color=set_color(self.curr_color, 110), render=self.render)
             button.set_pos(center=self.breakpoints[index][1])
         
-        if self.input_node is not None:
+        if self.input_node is not None and tuple(self.breakpoints[-1][1]) != self.input_node.node_button.rect.center:
             self.breakpoints[-1][1] = self.input_node.node_button.rect.center
-        if self.output_node is not None:
+            self._mark_moved()
+        if self.output_node is not None and tuple(self.breakpoints[0][0]) != self.output_node.node_button.rect.center:
             self.breakpoints[0][0] = self.output_node.node_button.rect.center
+            self._mark_moved()
         
-        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_pos = get_mouse_pos()
         self.grid_mouse_pos = tuple(list((i - (i % GRID_SIZE)) for i in self.mouse_pos))
 
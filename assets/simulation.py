@@ -0,0 +1,185 @@
+import time
+import heapq
+from typing import Callable
+from assets.netlist import Netlist, GateRecord
+
+class Simulator:
+    def __init__(self, netlist: Netlist, clock: Callable[[], float] = time.time, functions: dict[int, Callable] = None, children: dict[int, 'Simulator'] = None) -> None:
+        self.netlist = netlist
+        self.clock = clock
+        self.states = [0] * self.netlist.net_count
+        self.functions = dict(functions) if functions is not None else {}
+        self.children = dict(children) if children is not None else {}
+        for index, record in enumerate(self.netlist.gates):
+            if record.kind == 'Custom' and index not in self.functions and index not in self.children:
+                self.children[index] = Simulator(record.netlist, self.clock)
+        self.max_evaluations = (len(self.netlist.gates) + 1) * 64
+        
+        self.pending = [(rank, index) for index, rank in enumerate(self.netlist.ranks)]
+        heapq.heapify(self.pending)
+        self.scheduled = [True] * len(self.netlist.gates)
+        self.deferred = set()
+        self.changed_nets = set()
+    
+    def _schedule(self, index: int):
+        if not self.scheduled[index]:
+            self.scheduled[index] = True
+            heapq.heappush(self.pending, (self.netlist.ranks[index], index))
+    
+    def set_state(self, net: int, state: int):
+        state = 1 if state else 0
+        if self.states[net] != state:
+            self.states[net] = state
+            self.changed_nets.add(net)
+            for index in self.netlist.fanout[net]:
+                self._schedule(index)
+    
+    def set_inputs(self, input_states: list[int]):
+        for net, state in zip(self.netlist.input_nets, input_states):
+            self.set_state(net, state)
+    
+    def get_outputs(self):
+        return [self.states[net] for net in self.netlist.output_nets]
+    
+    def get_state(self, net: int):
+        return self.states[net]
+    
+    def _evaluate(self, index: int, record: GateRecord):
+        states = self.states
+        match record.kind:
+            case 'And':
+                return [1 if states[record.inputs[0]] and states[record.inputs[1]] else 0]
+            case 'Not':
+                return [0 if states[record.inputs[0]] else 1]
+            case 'Or':
+                return [1 if any(states[net] for net in record.inputs) else 0]
+            case 'Timer':
+                return [int(self.clock()) % 2]
+            case 'Custom':
+                if index in self.functions:
+                    return self.functions[index]([states[net] for net in record.inputs])
+                child = self.children[index]
+                outputs = child.evaluate([states[net] for net in record.inputs])
+                if child.pending:
+                    self.deferred.add(index)
+                return outputs
+    
+    def run(self):
+        for index in self.netlist.volatile_gates:
+            self._schedule(index)
+        for index in self.deferred:
+            self._schedule(index)
+        self.deferred.clear()
+        
+        gates = self.netlist.gates
+        evaluations = 0
+        while self.pending and evaluations < self.max_evaluations:
+            _, index = heapq.heappop(self.pending)
+            self.scheduled[index] = False
+            record = gates[index]
+            for net, state in zip(record.outputs, self._evaluate(index, record)):
+                self.set_state(net, state)
+            evaluations += 1
+        
+        changed_nets = self.changed_nets
+        self.changed_nets = set()
+        return changed_nets
+    
+    def evaluate(self, input_states: list[int]):
+        self.set_inputs(input_states)
+        self.run()
+        return self.get_outputs()
+
+class BitParallelSimulator:
+    def __init__(self, netlist: Netlist, width: int = 64, clock: Callable[[], float] = time.time) -> None:
+        self.netlist = netlist
+        self.width = width
+        self.mask = (1 << self.width) - 1
+        self.clock = clock
+        self.states = [0] * self.netlist.net_count
+        self.children = {index: BitParallelSimulator(record.netlist, self.width, self.clock) for index, record in enumerate(self.netlist.gates) if record.kind == 'Custom'}
+        self.feedback_components = set(self.netlist.feedback_components)
+    
+    def set_inputs(self, input_words: list[int]):
+        for net, word in zip(self.netlist.input_nets, input_words):
+            self.states[net] = word & self.mask
+    
+    def get_outputs(self):
+        return [self.states[net] for net in self.netlist.output_nets]
+    
+    def _evaluate(self, index: int, record: GateRecord):
+        states = self.states
+        match record.kind:
+            case 'And':
+                return [states[record.inputs[0]] & states[record.inputs[1]]]
+            case 'Not':
+                return [~states[record.inputs[0]] & self.mask]
+            case 'Or':
+                word = 0
+                for net in record.inputs:
+                    word |= states[net]
+                return [word]
+            case 'Timer':
+                return [self.mask if int(self.clock()) % 2 else 0]
+            case 'Custom':
+                return self.children[index].evaluate([states[net] for net in record.inputs])
+    
+    def _evaluate_into_states(self, index: int):
+        record = self.netlist.gates[index]
+        changed = False
+        for net, word in zip(record.outputs, self._evaluate(index, record)):
+            if self.states[net] != word:
+                self.states[net] = word
+                changed = True
+        
+        return changed
+    
+    def run(self):
+        for rank, component in enumerate(self.netlist.components):
+            if rank in self.feedback_components:
+                for _ in range((len(component) + 1) * 2):
+                    changed = False
+                    for index in component:
+                        changed = self._evaluate_into_states(index) or changed
+                    if not changed:
+                        break
+            else:
+                self._evaluate_into_states(component[0])
+    
+    def evaluate(self, input_words: list[int]):
+        self.set_inputs(input_words)
+        self.run()
+        return self.get_outputs()
+
+def pack_vectors(vectors: list[list[int]]):
+    words = [0] * (len(vectors[0]) if vectors else 0)
+    for bit, vector in enumerate(vectors):
+        for index, state in enumerate(vector):
+            if state:
+                words[index] |= 1 << bit
+    
+    return words
+
+def unpack_vectors(words: list[int], count: int):
+    return [[(word >> bit) & 1 for word in words] for bit in range(count)]
+
+def get_exhaustive_input_words(input_amt: int):
+    count = 2 ** input_amt
+    words = []
+    for index in range(input_amt):
+        period = 1 << (input_amt - 1 - index)
+        word = ((1 << period) - 1) << period
+        length = period * 2
+        while length < count:
+            word |= word << length
+            length *= 2
+        words.append(word)
+    
+    return words
+
+def get_truth_table(netlist: Netlist):
+    count = 2 ** len(netlist.input_nets)
+    simulator = BitParallelSimulator(netlist, count)
+    output_words = simulator.evaluate(get_exhaustive_input_words(len(netlist.input_nets)))
+    
+    return [tuple(outputs) for outputs in unpack_vectors(output_words, count)]
@@ -0,0 +1,61 @@
+import pygame
+
+class SpatialGrid:
+    def __init__(self, cell_size: int = 64) -> None:
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], set] = {}
+        self.item_cells: dict[object, frozenset] = {}
+    
+    def _get_rect_cells(self, rect: pygame.Rect):
+        left = int(rect.left // self.cell_size)
+        top = int(rect.top // self.cell_size)
+        right = int((rect.right - 1) // self.cell_size) if rect.width > 0 else left
+        bottom = int((rect.bottom - 1) // self.cell_size) if rect.height > 0 else top
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
+    
+    def _get_cells(self, rects: list[pygame.Rect]):
+        cells = set()
+        for rect in rects:
+            cells.update(self._get_rect_cells(rect))
+        return frozenset(cells)
+    
+    def update(self, item, rects: list[pygame.Rect]):
+        cells = self._get_cells(rects)
+        if self.item_cells.get(item) == cells:
+            return
+        
+        self.remove(item)
+        self.item_cells[item] = cells
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(item)
+    
+    def remove(self, item):
+        for cell in self.item_cells.pop(item, ()):
+            items = self.cells[cell]
+            items.discard(item)
+            if not items:
+                self.cells.pop(cell)
+    
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+    
+    def query_point(self, pos):
+        return set(self.cells.get((int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)), ()))
+    
+    def query_rect(self, rect: pygame.Rect):
+        items = set()
+        for cell in self._get_rect_cells(rect):
+            items.update(self.cells.get(cell, ()))
+        return items
+    
+    def __contains__(self, item):
+        return item in self.item_cells
+    
+    def __iter__(self):
+        return iter(self.item_cells)
+
+def get_segment_rect(start, end, padding: int = 0):
+    left, right = min(start[0], end[0]), max(start[0], end[0])
+    top, bottom = min(start[1], end[1]), max(start[1], end[1])
+    return pygame.Rect(left - padding, top - padding, right - left + 1 + padding * 2, bottom - top + 1 + padding * 2)
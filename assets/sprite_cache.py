@@ -0,0 +1,25 @@
+import pygame
+from collections import OrderedDict
+from typing import Callable
+from assets.settings import GATE_SPRITE_CACHE_SIZE
+
+class SpriteCache:
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self.sprites: OrderedDict = OrderedDict()
+    
+    def get(self, key, render_func: Callable[[], pygame.Surface]) -> pygame.Surface:
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_func()
+            self.sprites[key] = sprite
+            if len(self.sprites) > self.max_size:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(key)
+        return sprite
+    
+    def clear(self):
+        self.sprites.clear()
+
+gate_sprites = SpriteCache(GATE_SPRITE_CACHE_SIZE)
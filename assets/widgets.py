@@ -1,6 +1,8 @@
 import pygame
 from typing import Callable, Literal
 from assets.modules import set_color
+from assets.fonts import get_font, render_text
+from assets.input_state import get_mouse_pressed, get_mouse_pos
 
 class Button:
     def __init__(self,
@@ -75,6 +77,7 @@ class Button:
         self.right_mouse_clicked_outside = True
         
         self.new_mouse_pos = False
+        self.idle = False
         
         self.button_opacity = 255
         self.button_color = set_color(self.bg_color, self.button_opacity) if self.bg_color != 'transparent' else None
@@ -211,6 +214,8 @@ class Button:
             self._set_topleft(pos)
     
     def configure(self, **kwargs):
+        idle_state = self._get_idle_state()
+        
         screen = kwargs.get('screen')
         if screen is not None:
             self.screen = screen
@@ -348,6 +353,9 @@ class Button:
         mouse_pos = kwargs.get('mouse_pos')
         if mouse_pos is not None:
             self.mouse_pos = mouse_pos
+        
+        if self._get_idle_state() != idle_state:
+            self.idle = False
     
     def update(self):
         clicked_info = []
@@ -356,33 +364,42 @@ class Button:
             mouse_rect = pygame.Rect(0, 0, 2, 2)
             mouse_rect.center = self.mouse_pos[0:2]
             
-            left_mouse_clicked = pygame.mouse.get_pressed()[0]
-            middle_mouse_clicked = pygame.mouse.get_pressed()[1]
-            right_mouse_clicked = pygame.mouse.get_pressed()[2]
+            left_mouse_clicked, middle_mouse_clicked, right_mouse_clicked = get_mouse_pressed()
+            any_mouse_clicked = left_mouse_clicked or middle_mouse_clicked or right_mouse_clicked
             
-            clicked_info = self._isclicked( mouse_rect,
-                                            self.rect,
-                                            left_mouse_clicked,
-                                            middle_mouse_clicked,
-                                            right_mouse_clicked,
-                                            hover_func              =  lambda: self._clicking(click_call_info=('on hover', self.on_hover)),
-                                            not_hover_func          =  lambda: self._clicking(click_call_info=('on not hover', self.on_not_hover)),
-                                            left_click_func         =  lambda: self._clicking(click_call_info=('on left clicked', self.on_left_mouse_button_clicked), many_actions_one_click=self.many_actions_one_click),
-                                            middle_click_func        =  lambda: self._clicking(click_call_info=('on middle clicked', self.on_middle_mouse_button_clicked)),
-                                            right_click_func        =  lambda: self._clicking(click_call_info=('on right clicked', self.on_right_mouse_button_clicked)),
-                                            left_not_clicked_func   =  lambda: self._clicking(click_call_info=('on not left clicked', self.on_not_left_mouse_button_clicked)),
-                                            middle_not_clicked_func  =  lambda: self._clicking(click_call_info=('on not middle clicked', self.on_not_middle_mouse_button_clicked)),
-                                            right_not_clicked_func  =  lambda: self._clicking(click_call_info=('on not right clicked', self.on_not_right_mouse_button_clicked)),
-                            )
+            if self.idle and not any_mouse_clicked and not mouse_rect.colliderect(self.rect):
+                clicked_info = False, False, False, False
+            else:
+                clicked_info = self._isclicked( mouse_rect,
+                                                self.rect,
+                                                left_mouse_clicked,
+                                                middle_mouse_clicked,
+                                                right_mouse_clicked,
+                                                hover_func              =  lambda: self._clicking(click_call_info=('on hover', self.on_hover)),
+                                                not_hover_func          =  lambda: self._clicking(click_call_info=('on not hover', self.on_not_hover)),
+                                                left_click_func         =  lambda: self._clicking(click_call_info=('on left clicked', self.on_left_mouse_button_clicked), many_actions_one_click=self.many_actions_one_click),
+                                                middle_click_func        =  lambda: self._clicking(click_call_info=('on middle clicked', self.on_middle_mouse_button_clicked)),
+                                                right_click_func        =  lambda: self._clicking(click_call_info=('on right clicked', self.on_right_mouse_button_clicked)),
+                                                left_not_clicked_func   =  lambda: self._clicking(click_call_info=('on not left clicked', self.on_not_left_mouse_button_clicked)),
+                                                middle_not_clicked_func  =  lambda: self._clicking(click_call_info=('on not middle clicked', self.on_not_middle_mouse_button_clicked)),
+                                                right_not_clicked_func  =  lambda: self._clicking(click_call_info=('on not right clicked', self.on_not_right_mouse_button_clicked)),
+                                )
+                self.idle = not any_mouse_clicked and not clicked_info[-1] and self._has_no_idle_callbacks()
         
         if self.render:
             self._draw()
         
         if not self.new_mouse_pos:
-            self.mouse_pos = pygame.mouse.get_pos()
+            self.mouse_pos = get_mouse_pos()
         
         return clicked_info
     
+    def _get_idle_state(self):
+        return self.bg_color, self.hover_color, self.disabled, self.on_not_hover, self.on_not_left_mouse_button_clicked, self.on_not_middle_mouse_button_clicked, self.on_not_right_mouse_button_clicked
+    
+    def _has_no_idle_callbacks(self):
+        return self.on_not_hover is None and self.on_not_left_mouse_button_clicked is None and self.on_not_middle_mouse_button_clicked is None and self.on_not_right_mouse_button_clicked is None
+    
     def _is_color(self, color):
         try:
             pygame.colordict.THECOLORS[color]
@@ -451,7 +468,7 @@ class Button:
         left_mouse_clicked = self.left_mouse_clicked and self.left_mouse_clicked_outside
         middle_mouse_clicked = self.middle_mouse_clicked and self.middle_mouse_clicked_outside
         right_mouse_clicked = self.right_mouse_clicked and self.right_mouse_clicked_outside
-
+        
         if left_mouse_clicked:
             left_click_func()
         else:
@@ -538,7 +555,7 @@ class Button:
                 print(color)
         if self.image_surf is not None:
             self.screen.blit(self.image_surf, self.img_rect)
-    
+
 class ScrollableSurface:
     def __init__(self, screen: pygame.Surface, sub_surf: pygame.Surface, sub_surf_pos: tuple, blit_surf_pos: tuple, blit_surf_size: tuple, blit_surf_color=None, scroll_wheel_color='white', scroll_wheel_size: int = 5, scroll_wheel_border_x_offset: float = 4, scroll_wheel_border_y_offset: float = 4, orientation: Literal['x', 'y', 'both'] = 'x') -> None:
         self.screen = screen
@@ -632,7 +649,7 @@ class ScrollableSurface:
         self.show_y_slider = self.orientation in ('y', 'both') and self.sub_surf.get_height() > self.blit_surf.get_height()
     
     def _on_move_surface_x(self):
-        mouse_x = pygame.mouse.get_pos()[0]
+        mouse_x = get_mouse_pos()[0]
         half_length = self.scroll_wheel_border_x_offset + (self.scroll_wheel_x.rect.width / 2)
         x = pygame.math.clamp(self.prev_x + (mouse_x - self.prev_mouse_x), self.blit_rect.x + half_length, self.blit_rect.right - half_length)
         self.scroll_wheel_x.set_pos(center=(x, self.scroll_wheel_x.rect.centery))
@@ -643,7 +660,7 @@ class ScrollableSurface:
         self.sub_surf_rect.x = self.sub_surf_pos[0] - (scroll_wheel_pos_ratio * (self.sub_surf_rect.width - self.blit_rect.width))
     
     def _on_move_surface_y(self):
-        mouse_y = pygame.mouse.get_pos()[1]
+        mouse_y = get_mouse_pos()[1]
         half_height = self.scroll_wheel_border_y_offset + (self.scroll_wheel_y.rect.height / 2)
         y = pygame.math.clamp(self.prev_y + (mouse_y - self.prev_mouse_y), self.blit_rect.y + half_height, self.blit_rect.bottom - half_height)
         self.scroll_wheel_y.set_pos(center=(self.scroll_wheel_y.rect.centerx, y))
@@ -655,11 +672,11 @@ class ScrollableSurface:
     
     def _on_not_move_surface_x(self):
         self.prev_x = self.scroll_wheel_x.rect.centerx
-        self.prev_mouse_x = pygame.mouse.get_pos()[0]
+        self.prev_mouse_x = get_mouse_pos()[0]
     
     def _on_not_move_surface_y(self):
         self.prev_y = self.scroll_wheel_y.rect.centery
-        self.prev_mouse_y = pygame.mouse.get_pos()[1]
+        self.prev_mouse_y = get_mouse_pos()[1]
     
     def draw(self):
         self.blit_surf.fill(pygame.Color(0, 0, 0, 0))
@@ -699,7 +716,7 @@ class ListView:
                  button_text_anchor: Literal['n', 's', 'e', 'w', 'nw', 'ne', 'sw', 'se', 'center'] = 'center',
                  font: pygame.font.FontType = None,
                  border_radius: int = 5) -> None:
-                 
+        
         self.screen = screen
         self.pos = pos
         self.width = width
@@ -717,8 +734,8 @@ class ListView:
         self.border_radius = border_radius
         
         self.buttons: list[Button] = []
-
-        self.font = pygame.font.SysFont('Arial', int(self.option_height)) if font is None else font
+        
+        self.font = get_font('Arial', int(self.option_height)) if font is None else font
         
         self.orientation_is_vertical = self.orientation == 'vertical'
         
@@ -790,7 +807,7 @@ class ListView:
         if button_text_color is not None:
             self.button_text_color = button_text_color
             for index, (name, _) in enumerate(self.options.items()):
-                self.buttons[index].configure(image=self.font.render(name, True, self.button_text_color))
+                self.buttons[index].configure(image=render_text(self.font, name, True, self.button_text_color))
         
         options = kwargs.get('options')
         if options is not None:
@@ -805,7 +822,7 @@ class ListView:
                             (self.width, self.option_height),
                             self.button_color,
                             hover_color=self.button_hover_color,
-                            image=self.font.render(name, True, self.button_text_color),
+                            image=render_text(self.font, name, True, self.button_text_color),
                             img_border_offset=(4, 0),
                             img_anchor=self.button_text_anchor,
                             on_left_mouse_button_clicked=func,
@@ -843,7 +860,7 @@ class MenuBar:
                  font_family: str = 'Arial',
                  dropdown_font_family: str = 'Jokerman') -> None:
         self.screen = screen
-                
+        
         self.y_pos = y_pos
         self.button_width = button_width
         self.button_height = button_height
@@ -863,8 +880,8 @@ class MenuBar:
         self.menu_option_buttons: list[Button] = []
         self.menu_option_dropdowns: list[ListView] = []
         
-        self.font = pygame.font.SysFont(font_family, int(self.button_height / 1.5), bold=True)
-        self.dropdown_font = pygame.font.SysFont(dropdown_font_family, int(self.dropdown_button_height / 1.5), )
+        self.font = get_font(font_family, int(self.button_height / 1.5), bold=True)
+        self.dropdown_font = get_font(dropdown_font_family, int(self.dropdown_button_height / 1.5))
         
         self.text_color = 'white' if sum(set_color(self.bg_color, 255)) / 3 < 125 else 'black'
         
@@ -922,7 +939,7 @@ class MenuBar:
             self.bg_color = bg_color
             self.text_color = 'white' if sum(set_color(self.bg_color, 255)) / 3 < 125 else 'black'
             for index, (menu_name, _) in enumerate(self.options.items()):
-                self.menu_option_buttons[index].configure(image=self.font.render(menu_name, True, self.text_color))
+                self.menu_option_buttons[index].configure(image=render_text(self.font, menu_name, True, self.text_color))
                 self.menu_option_dropdowns[index].configure(bg_color=self.bg_color)
             for button in self.menu_option_buttons:
                 button.configure(bg_color=self.bg_color)
@@ -941,7 +958,7 @@ class MenuBar:
                              self.y_border_offset + self.y_pos),
                             (self.button_width, self.button_height),
                             self.button_color,
-                            image=self.font.render(menu_name, True, self.text_color),
+                            image=render_text(self.font, menu_name, True, self.text_color),
                             on_hover=self._get_menu_opt_hover_func(index),
                             on_left_mouse_button_clicked=self._get_menu_button_func(index))
             dropdown = ListView(self.screen,
@@ -986,7 +1003,7 @@ class MenuBar:
             mouse_clicked, _, _, _ = button.update()
             buttons_clicked.append(mouse_clicked)
         
-        if pygame.mouse.get_pressed()[0] and True not in buttons_clicked:
+        if get_mouse_pressed()[0] and True not in buttons_clicked:
             if self.dropdown_index != -1:
                 list_view = self.menu_option_dropdowns[self.dropdown_index]
                 list_view.update()
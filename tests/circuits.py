@@ -0,0 +1,76 @@
+def make_gate(name: str, logic, input_amt: int, output_amt: int, pos=(0, 0)):
+    return {
+        'name': name,
+        'input_amt': input_amt,
+        'output_amt': output_amt,
+        'logic_func_or_circuit_or_circuit_dict': logic,
+        'node_on_color': [200, 0, 0],
+        'node_off_color': [90, 90, 90],
+        'pos': pos,
+    }
+
+def make_wire(start, end, breakpoints=()):
+    return {
+        'width': 5,
+        'color_on': 'pink',
+        'color_off': 'darkgrey',
+        'first_pos_tracker': [start, end],
+        'breakpoints': [list(segment) for segment in breakpoints],
+    }
+
+def make_circuit(name: str, input_amt: int, output_amt: int, gates: list[dict], connections: list[list[int]]):
+    # each connection lists its driver first; the editor only has two-ended wires
+    pairs = [[nodes[0], sink] for nodes in connections for sink in nodes[1:]]
+    return {
+        'name': name,
+        'node_base_line': 500,
+        'add_nodes_buttons_height': 40,
+        'border_offset': 10,
+        'border_width': 20,
+        'top_level': 30,
+        'theme_color': 'red',
+        'input_node_objects': [100 + index * 40 for index in range(input_amt)],
+        'output_node_objects': [100 + index * 40 for index in range(output_amt)],
+        'gates': gates,
+        'wires': [make_wire((index, 0), (index, 10)) for index in range(len(pairs))],
+        'wire_connected_indexes': pairs,
+    }
+
+def and_gate(pos=(0, 0)):
+    return make_gate('And', '#functionAnd', 2, 1, pos)
+
+def not_gate(pos=(0, 0)):
+    return make_gate('Not', '#functionNot', 1, 1, pos)
+
+def or_circuit():
+    # a OR b == NOT(NOT a AND NOT b); nodes: in 0-1, not 2-3, not 4-5, and 6-8, not 9-10, out 11
+    gates = [not_gate(), not_gate(), and_gate(), not_gate()]
+    return make_circuit('Or', 2, 1, gates, [[0, 2], [1, 4], [3, 6], [5, 7], [8, 9], [10, 11]])
+
+def xor_circuit():
+    # (a AND NOT b) OR (NOT a AND b); nodes: in 0-1, not 2-3, not 4-5, and 6-8, and 9-11, or 12-14, out 15
+    gates = [not_gate(), not_gate(), and_gate(), and_gate(), make_gate('Or', or_circuit(), 2, 1)]
+    return make_circuit('Xor', 2, 1, gates, [[0, 2, 6], [1, 4, 9], [5, 7], [3, 10], [8, 12], [11, 13], [14, 15]])
+
+def parity_circuit():
+    # a XOR b XOR c from two custom Xor gates; nodes: in 0-2, xor 3-5, xor 6-8, out 9
+    gates = [make_gate('Xor', xor_circuit(), 2, 1), make_gate('Xor', xor_circuit(), 2, 1)]
+    return make_circuit('Parity', 3, 1, gates, [[0, 3], [1, 4], [5, 6], [2, 7], [8, 9]])
+
+def constant_circuit():
+    # no inputs, output is NOT of the constant net; nodes: not 0-1, out 2
+    return make_circuit('One', 0, 1, [not_gate()], [[1, 2]])
+
+def sr_latch_circuit():
+    # NOR latch built from custom Or gates and Nots; nodes: in S 0, R 1,
+    # or 2-4, not 5-6, or 7-9, not 10-11, out Q 12, out Qn 13
+    gates = [make_gate('Or', or_circuit(), 2, 1), not_gate(), make_gate('Or', or_circuit(), 2, 1), not_gate()]
+    return make_circuit('SR', 2, 2, gates, [[1, 2], [4, 5], [6, 8, 12], [0, 7], [9, 10], [11, 3, 13]])
+
+def make_project(circuits: list[dict], gate_options: list[dict] = (), circuit_index: int = 0):
+    return {
+        'theme_color': 'red',
+        'circuit index': circuit_index,
+        'circuits': list(circuits),
+        'gate options': list(gate_options),
+    }
@@ -0,0 +1,12 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+@pytest.fixture
+def screen():
+    import pygame
+    pygame.init()
+    return pygame.display.set_mode((1200, 600))
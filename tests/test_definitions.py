@@ -0,0 +1,31 @@
+import copy
+from assets import logic_file
+from assets.definitions import get_definition_key
+from circuits import make_project, make_gate, xor_circuit, or_circuit, parity_circuit
+
+def test_key_survives_binary_round_trip():
+    circuit = parity_circuit()
+    info = logic_file.loads(logic_file.dumps(make_project([circuit])))
+    assert get_definition_key(info['circuits'][0]) == get_definition_key(circuit)
+
+def test_key_ignores_cosmetic_fields():
+    circuit = xor_circuit()
+    moved = copy.deepcopy(circuit)
+    moved['name'] = 'Renamed'
+    moved['theme_color'] = 'blue'
+    moved['input_node_objects'] = [300, 340]
+    moved['gates'] = [{**gate_info, 'pos': (50, 60), 'node_on_color': (1, 2, 3)} for gate_info in moved['gates']]
+    moved['wires'] = [{**wire, 'breakpoints': [[(1, 2), (3, 4)]]} for wire in moved['wires']]
+    moved['wire_connected_indexes'] = [tuple(reversed(nodes)) for nodes in reversed(moved['wire_connected_indexes'])]
+    
+    assert get_definition_key(moved) == get_definition_key(circuit)
+
+def test_key_follows_topology():
+    circuit = xor_circuit()
+    rewired = copy.deepcopy(circuit)
+    rewired['wire_connected_indexes'][0] = [1, 2]
+    child_changed = copy.deepcopy(circuit)
+    child_changed['gates'][4] = make_gate('Or', parity_circuit(), 3, 1)
+    
+    keys = {get_definition_key(circuit), get_definition_key(rewired), get_definition_key(child_changed), get_definition_key(or_circuit())}
+    assert len(keys) == 4
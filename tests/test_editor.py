@@ -0,0 +1,218 @@
+import os
+import pickle
+import pytest
+from assets import logic_file
+from circuits import make_project, make_circuit, xor_circuit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def display(screen):
+    from assets.logic_circuits_display import CircuitDisplay
+    
+    display = CircuitDisplay(screen, 10, 30, (30, 39), 40)
+    display.theme_color = (66, 71, 81)
+    return display
+
+@pytest.fixture
+def open_app(screen, tmp_path, monkeypatch):
+    import assets.App
+    
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(assets.App, 'DEFINITION_LIBRARY_PATH', str(tmp_path / 'library'))
+    
+    def open_app(file_path: str):
+        app = assets.App.App(file_path, False)
+        app.autosave.interval = 0
+        return app
+    
+    return open_app
+
+def run_frames(app, count: int = 5):
+    for _ in range(count):
+        app._run_frame()
+    app.autosave.wait()
+
+def make_gate_option(display, circuit_dict: dict, name: str):
+    display.circuit.set_dict(circuit_dict)
+    display.textinput.value = name
+    display._make_gate()
+    gate = display.circuit.gate[0]
+    display.gate_options.append(gate)
+    display._add_gate_to_viewer(gate)
+    display.gate_circuits.append(gate.logic_func_or_circuit_or_circuit_dict)
+    return gate
+
+def test_gate_option_key_survives_save_and_load(display, screen, tmp_path):
+    from assets.logic_circuits_display import CircuitDisplay
+    
+    key = make_gate_option(display, xor_circuit(), 'Xor').definition.key
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(display.get_dict(), path)
+    
+    reloaded = CircuitDisplay(screen, 10, 30, (30, 39), 40)
+    reloaded.set_dict(logic_file.load(path))
+    assert [gate.definition.key for gate in reloaded.gate_options if gate.definition is not None] == [key]
+
+def test_opening_project_does_not_modify_it(open_app, tmp_path):
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit()], circuit_index=0), path)
+    with open(path, 'rb') as file:
+        data = file.read()
+    
+    app = open_app(path)
+    run_frames(app)
+    
+    assert app.circuit_displayer.version == app.saved_version
+    with open(path, 'rb') as file:
+        assert file.read() == data
+    assert sorted(os.listdir(tmp_path)) == ['library', 'project.logic']
+
+def test_edit_is_autosaved(open_app, tmp_path):
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit()]), path)
+    
+    app = open_app(path)
+    run_frames(app)
+    gate = app.circuit_displayer.circuit.gates[0]
+    gate.set_pos((gate.button.rect.centerx + 40, gate.button.rect.centery))
+    run_frames(app)
+    
+    assert app.circuit_displayer.version == app.saved_version
+    assert logic_file.load(path)['circuits'][0]['gates'][0]['pos'] != xor_circuit()['gates'][0]['pos']
+
+def test_legacy_project_is_not_autosaved(open_app, tmp_path):
+    path = str(tmp_path / 'legacy.logic')
+    data = pickle.dumps(make_project([xor_circuit()]))
+    with open(path, 'wb') as file:
+        file.write(data)
+    
+    app = open_app(path)
+    run_frames(app)
+    app.circuit_displayer.circuit._mark_modified()
+    run_frames(app)
+    
+    assert app.circuit_displayer.version != app.saved_version
+    with open(path, 'rb') as file:
+        assert file.read() == data
+
+def test_wire_following_moved_gate_is_reindexed(open_app, tmp_path):
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit()]), path)
+    
+    app = open_app(path)
+    run_frames(app)
+    circuit = app.circuit_displayer.circuit
+    gate = circuit.gates[4]
+    gate.set_pos((gate.button.rect.centerx + 200, gate.button.rect.centery + 120))
+    run_frames(app)
+    
+    wire = next(wire for wire in circuit.wires if wire.input_node is gate.input_nodes[0])
+    circuit._sync_spatial_index()
+    assert wire in circuit.spatial_index.query_point(gate.input_nodes[0].node_button.rect.center)
+
+def test_wire_right_click_survives_click_state_churn(open_app, tmp_path, monkeypatch):
+    import pygame
+    from assets.modules import get_click_state
+    from assets.settings import CLICK_STATE_CACHE_SIZE
+    
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([make_circuit('Wire', 1, 1, [], [[0, 1]])]), path)
+    app = open_app(path)
+    circuit = app.circuit_displayer.circuit
+    pressed = [False, False, False]
+    monkeypatch.setattr(pygame.mouse, 'get_pressed', lambda *args: tuple(pressed))
+    run_frames(app)
+    
+    wire = circuit.wires[0]
+    start, end = wire.breakpoints[0]
+    mouse_pos = ((start[0] + end[0]) // 2, (start[1] + end[1]) // 2)
+    monkeypatch.setattr(pygame.mouse, 'get_pos', lambda: mouse_pos)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=mouse_pos))
+    run_frames(app, 2)
+    for index in range(CLICK_STATE_CACHE_SIZE + 1):
+        get_click_state(('churn', index))
+    
+    pressed[2] = True
+    run_frames(app, 1)
+    assert wire not in circuit.wires
+
+def test_button_stays_idle_across_unchanged_configure(screen, monkeypatch):
+    from assets.input_state import input_state
+    from assets.widgets import Button
+    
+    monkeypatch.setattr(input_state, 'active', True)
+    monkeypatch.setattr(input_state, 'pressed', (False, False, False))
+    monkeypatch.setattr(input_state, 'mouse_pos', (500, 500))
+    button = Button(screen, (10, 10), (20, 20), bg_color='grey')
+    button.update()
+    button.update()
+    assert button.idle
+    
+    button.configure(bg_color='grey', render=True)
+    assert button.idle
+    
+    button.configure(bg_color='red')
+    assert not button.idle
+
+def test_idle_button_still_receives_clicks(screen, monkeypatch):
+    from assets.input_state import input_state
+    from assets.widgets import Button
+    
+    clicks = []
+    monkeypatch.setattr(input_state, 'active', True)
+    monkeypatch.setattr(input_state, 'pressed', (False, False, False))
+    monkeypatch.setattr(input_state, 'mouse_pos', (500, 500))
+    button = Button(screen, (10, 10), (20, 20), on_left_mouse_button_clicked=lambda: clicks.append(True))
+    button.update()
+    button.update()
+    assert button.idle
+    
+    monkeypatch.setattr(input_state, 'mouse_pos', (20, 20))
+    button.update()
+    monkeypatch.setattr(input_state, 'pressed', (True, False, False))
+    button.update()
+    assert clicks
+
+def test_quiet_frames_skip_redraw_until_input(open_app, tmp_path, monkeypatch):
+    import pygame
+    from assets.settings import IDLE_FRAME_THRESHOLD
+    
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit()]), path)
+    app = open_app(path)
+    app.circuit_displayer._free_textinput_focus()
+    run_frames(app, IDLE_FRAME_THRESHOLD + 5)
+    
+    drawn_frames = []
+    app_loop = app._app_loop
+    monkeypatch.setattr(app, '_app_loop', lambda: drawn_frames.append(app_loop()))
+    run_frames(app, 3)
+    assert not drawn_frames
+    
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 10)))
+    run_frames(app, 1)
+    assert len(drawn_frames) == 1
+
+def test_hit_tests_follow_moved_and_removed_gates(open_app, tmp_path):
+    import pygame
+    
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit()]), path)
+    app = open_app(path)
+    run_frames(app)
+    circuit = app.circuit_displayer.circuit
+    gate = circuit.gates[4]
+    old_rect = gate.button.rect.copy()
+    gate.set_pos((old_rect.centerx + 300, old_rect.centery + 150))
+    run_frames(app)
+    
+    node = gate.input_nodes[0]
+    assert circuit.get_node_at(node.node_button.rect.center) is node
+    assert gate in circuit.get_gates_in_rect(gate.button.rect)
+    assert gate not in circuit.get_gates_in_rect(pygame.Rect(old_rect.center, (1, 1)))
+    
+    circuit.make_remove_gate_func(4)()
+    run_frames(app)
+    assert gate not in circuit.get_gates_in_rect(gate.button.rect)
+    assert circuit.get_node_at(node.node_button.rect.center) is None
@@ -0,0 +1,134 @@
+import os
+import pickle
+import struct
+import pytest
+from assets import logic_file
+from circuits import make_project, make_circuit, xor_circuit, or_circuit, sr_latch_circuit, parity_circuit, make_gate
+
+def normalize(info: dict):
+    return logic_file.loads(logic_file.dumps(info))
+
+@pytest.fixture
+def project_path(tmp_path):
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([xor_circuit(), or_circuit()]), path)
+    return path
+
+def test_binary_round_trip():
+    info = make_project([parity_circuit(), sr_latch_circuit()], [make_gate('Xor', xor_circuit(), 2, 1)], 1)
+    data = logic_file.dumps(info)
+    
+    assert data.startswith(logic_file.MAGIC)
+    assert logic_file.loads(data) == info
+    assert logic_file.dumps(logic_file.loads(data)) == data
+
+def test_lazy_load_reads_circuits_on_demand():
+    info = make_project([parity_circuit(), sr_latch_circuit()])
+    lazy = logic_file.loads(logic_file.dumps(info), lazy=True)
+    
+    assert all(callable(circuit) for circuit in lazy['circuits'])
+    assert [circuit() for circuit in lazy['circuits']] == info['circuits']
+
+def test_save_project_round_trip(tmp_path):
+    path = str(tmp_path / 'saved.logic')
+    info = make_project([xor_circuit(), parity_circuit()])
+    logic_file.save_project(info, path)
+    
+    assert logic_file.load(path) == info
+
+def test_journal_replays_circuit_and_project_records(project_path):
+    info, journal = logic_file.load_project(project_path)
+    
+    changed = sr_latch_circuit()
+    journal.append_circuit(1, changed)
+    gate_options = [make_gate('Xor', xor_circuit(), 2, 1)]
+    journal.append_project({'theme_color': 'blue', 'circuit index': 2, 'gate options': gate_options}, [1, 0, -1], [or_circuit()])
+    
+    expected = make_project([changed, xor_circuit(), or_circuit()], gate_options, 2)
+    expected['theme_color'] = 'blue'
+    assert logic_file.load(project_path) == normalize(expected)
+
+def parity_top_circuit(pos=(0, 0)):
+    # nodes: in 0-2, parity 3-6, out 7
+    return make_circuit('Top', 3, 1, [make_gate('Parity', parity_circuit(), 3, 1, pos)], [[0, 3], [1, 4], [2, 5], [6, 7]])
+
+def test_journal_records_reference_base_definitions(tmp_path):
+    path = str(tmp_path / 'project.logic')
+    logic_file.save_project(make_project([parity_top_circuit()], [make_gate('Parity', parity_circuit(), 3, 1)]), path)
+    
+    _, journal = logic_file.load_project(path)
+    moved = parity_top_circuit((40, 0))
+    journal.append_circuit(0, moved)
+    
+    assert os.path.getsize(path + logic_file.JOURNAL_SUFFIX) < len(logic_file.dumps(make_project([moved]))) / 4
+    assert logic_file.load(path)['circuits'][0] == moved
+
+def test_journal_is_not_created_on_load(project_path):
+    logic_file.load_project(project_path)
+    assert not os.path.exists(project_path + logic_file.JOURNAL_SUFFIX)
+
+@pytest.mark.parametrize('cut', [1, 5, 9, 64])
+def test_journal_torn_tail_falls_back_to_last_record(project_path, cut):
+    _, journal = logic_file.load_project(project_path)
+    journal.append_circuit(0, sr_latch_circuit())
+    consistent_size = os.path.getsize(project_path + logic_file.JOURNAL_SUFFIX)
+    journal.append_project({'theme_color': 'red', 'circuit index': 2, 'gate options': []}, [0, 1, -1], [or_circuit()])
+    
+    journal_path = project_path + logic_file.JOURNAL_SUFFIX
+    with open(journal_path, 'rb') as file:
+        data = file.read()
+    with open(journal_path, 'wb') as file:
+        file.write(data[:-cut])
+    
+    info, _ = logic_file.load_project(project_path)
+    info['circuits'] = [circuit() if callable(circuit) else circuit for circuit in info['circuits']]
+    assert info == normalize(make_project([sr_latch_circuit(), or_circuit()]))
+    assert os.path.getsize(journal_path) == consistent_size
+
+def test_journal_corrupted_record_is_ignored(project_path):
+    _, journal = logic_file.load_project(project_path)
+    journal.append_circuit(0, sr_latch_circuit())
+    
+    journal_path = project_path + logic_file.JOURNAL_SUFFIX
+    with open(journal_path, 'r+b') as file:
+        file.seek(-3, os.SEEK_END)
+        file.write(b'\xff\xff\xff')
+    
+    assert logic_file.load(project_path) == normalize(make_project([xor_circuit(), or_circuit()]))
+
+def test_journal_is_ignored_after_full_save(project_path):
+    _, journal = logic_file.load_project(project_path)
+    journal.append_circuit(0, sr_latch_circuit())
+    
+    logic_file.save_project(make_project([or_circuit()]), project_path)
+    assert logic_file.load(project_path) == normalize(make_project([or_circuit()]))
+
+class _PickleProbe:
+    loaded = False
+    
+    def __reduce__(self):
+        return (_mark_pickle_loaded, ())
+
+def _mark_pickle_loaded():
+    _PickleProbe.loaded = True
+    return {}
+
+def test_loads_rejects_non_binary_data():
+    with pytest.raises(ValueError):
+        logic_file.loads(pickle.dumps(_PickleProbe()))
+    assert not _PickleProbe.loaded
+
+def test_journal_record_with_pickle_body_is_not_unpickled(project_path):
+    _, journal = logic_file.load_project(project_path)
+    journal._append(logic_file._RECORD_CIRCUIT, struct.pack('<I', 0) + pickle.dumps(_PickleProbe()))
+    
+    assert logic_file.load(project_path) == normalize(make_project([xor_circuit(), or_circuit()]))
+    assert not _PickleProbe.loaded
+
+def test_legacy_pickle_project_still_loads(tmp_path):
+    path = str(tmp_path / 'legacy.logic')
+    info = make_project([xor_circuit()])
+    with open(path, 'wb') as file:
+        file.write(pickle.dumps(info))
+    
+    assert logic_file.load_project(path) == (info, None)
@@ -0,0 +1,27 @@
+import pytest
+from assets.netlist import CONST_NET, compile_circuit
+from circuits import make_circuit, make_gate, and_gate, xor_circuit, parity_circuit
+
+def test_compile_circuit_maps_pins_to_nets():
+    netlist = compile_circuit(xor_circuit())
+    
+    assert [record.kind for record in netlist.gates] == ['Not', 'Not', 'And', 'And', 'Custom']
+    assert len(netlist.input_nets) == 2 and len(netlist.output_nets) == 1
+    assert netlist.gates[2].inputs == (netlist.input_nets[0], netlist.gates[1].outputs[0])
+    assert netlist.gates[4].outputs == netlist.output_nets
+    assert [record.source_index for record in netlist.gates] == list(range(5))
+
+def test_compile_circuit_compiles_nested_custom_gates():
+    netlist = compile_circuit(parity_circuit())
+    
+    assert [record.kind for record in netlist.gates] == ['Custom', 'Custom']
+    assert [record.kind for record in netlist.gates[0].netlist.gates][-1] == 'Custom'
+    assert netlist.gates[1].inputs[0] == netlist.gates[0].outputs[0]
+
+def test_unconnected_inputs_read_the_constant_net():
+    netlist = compile_circuit(make_circuit('Open', 1, 1, [and_gate()], [[0, 1], [3, 4]]))
+    assert netlist.gates[0].inputs == (netlist.input_nets[0], CONST_NET)
+
+def test_gate_without_compilable_logic_is_rejected():
+    with pytest.raises(ValueError):
+        compile_circuit(make_circuit('Bad', 0, 0, [make_gate('Bad', '#functionNope', 1, 1)], []))
@@ -0,0 +1,115 @@
+import os
+import pytest
+from assets.netlist import compile_circuit, flatten_netlist
+from assets.netlist_cache import NetlistCache, NetlistLibrary, pack_netlist, unpack_netlist, write_netlist_cache, is_cacheable, NETLIST_CACHE_SUFFIX, NETLIST_LIBRARY_SUFFIX
+from assets import logic_file
+from assets.definitions import get_definition_key, add_netlist_cache, remove_netlist_cache, _get_cached_netlist
+from assets.simulation import get_truth_table
+from circuits import make_project, xor_circuit, parity_circuit, or_circuit
+
+def get_netlists():
+    return {
+        '01' * 20: flatten_netlist(compile_circuit(xor_circuit())),
+        '02' * 20: flatten_netlist(compile_circuit(parity_circuit())),
+        '03' * 20: flatten_netlist(compile_circuit(or_circuit())),
+    }
+
+def assert_same_netlist(netlist, expected):
+    assert netlist.net_count == expected.net_count
+    assert tuple(netlist.input_nets) == tuple(expected.input_nets)
+    assert tuple(netlist.output_nets) == tuple(expected.output_nets)
+    assert [(record.kind, tuple(record.inputs), tuple(record.outputs)) for record in netlist.gates] == [(record.kind, tuple(record.inputs), tuple(record.outputs)) for record in expected.gates]
+    assert get_truth_table(netlist) == get_truth_table(expected)
+
+def test_pack_round_trip():
+    netlist = get_netlists()['02' * 20]
+    assert_same_netlist(unpack_netlist(memoryview(pack_netlist(netlist))), netlist)
+
+def test_custom_gates_are_not_cacheable():
+    assert not is_cacheable(compile_circuit(xor_circuit()))
+
+def test_cache_file_round_trip(tmp_path):
+    path = str(tmp_path / ('project.logic' + NETLIST_CACHE_SUFFIX))
+    netlists = get_netlists()
+    write_netlist_cache(path, netlists)
+    
+    cache = NetlistCache(path)
+    for key, netlist in netlists.items():
+        assert key in cache
+        assert_same_netlist(cache.get(key), netlist)
+    assert cache.get('ff' * 20) is None
+
+def test_truncated_cache_file_is_empty(tmp_path):
+    path = str(tmp_path / ('project.logic' + NETLIST_CACHE_SUFFIX))
+    with open(path, 'wb') as file:
+        file.write(b'IFLN')
+    
+    assert NetlistCache(path).get('01' * 20) is None
+
+def test_cache_hits_for_reloaded_circuit(tmp_path):
+    path = str(tmp_path / 'project.logic')
+    circuit = parity_circuit()
+    logic_file.save_project(make_project([circuit]), path)
+    netlist = flatten_netlist(compile_circuit(circuit))
+    write_netlist_cache(path + NETLIST_CACHE_SUFFIX, {get_definition_key(circuit): netlist})
+    
+    reloaded = logic_file.load(path)['circuits'][0]
+    assert_same_netlist(NetlistCache(path + NETLIST_CACHE_SUFFIX).get(get_definition_key(reloaded)), netlist)
+
+@pytest.fixture
+def library_sizes(tmp_path):
+    library = NetlistLibrary(str(tmp_path / 'sizing'), 1 << 20)
+    library.store(get_netlists())
+    return dict(library.entries)
+
+def test_library_evicts_least_recently_used(tmp_path, library_sizes):
+    first, second, third = library_sizes
+    directory = str(tmp_path / 'library')
+    library = NetlistLibrary(directory, library_sizes[first] + library_sizes[second] + library_sizes[third] - 1)
+    netlists = get_netlists()
+    
+    library.store({first: netlists[first], second: netlists[second]})
+    assert library.get(first) is not None
+    library.store({third: netlists[third]})
+    
+    assert second not in library
+    assert library.get(second) is None
+    assert not os.path.exists(os.path.join(directory, second + NETLIST_LIBRARY_SUFFIX))
+    assert_same_netlist(library.get(first), netlists[first])
+    assert_same_netlist(library.get(third), netlists[third])
+    assert library.size == library_sizes[first] + library_sizes[third]
+
+def test_library_reloads_entries_from_disk(tmp_path):
+    directory = str(tmp_path / 'library')
+    netlists = get_netlists()
+    NetlistLibrary(directory, 1 << 20).store(netlists)
+    
+    library = NetlistLibrary(directory, 1 << 20)
+    for key, netlist in netlists.items():
+        assert_same_netlist(library.get(key), netlist)
+
+def test_library_treats_missing_file_as_miss(tmp_path):
+    directory = str(tmp_path / 'library')
+    library = NetlistLibrary(directory, 1 << 20)
+    key = '01' * 20
+    library.store({key: get_netlists()[key]})
+    os.remove(os.path.join(directory, key + NETLIST_LIBRARY_SUFFIX))
+    
+    assert library.get(key) is None
+
+def test_project_cache_is_consulted_before_library(tmp_path):
+    netlists = get_netlists()
+    key = '01' * 20
+    library = NetlistLibrary(str(tmp_path / 'library'), 1 << 20)
+    library.store({key: netlists['02' * 20]})
+    path = str(tmp_path / ('project.logic' + NETLIST_CACHE_SUFFIX))
+    write_netlist_cache(path, {key: netlists[key]})
+    project_cache = NetlistCache(path)
+    
+    add_netlist_cache(library)
+    add_netlist_cache(project_cache)
+    try:
+        assert_same_netlist(_get_cached_netlist(key), netlists[key])
+    finally:
+        remove_netlist_cache(project_cache)
+        remove_netlist_cache(library)
@@ -0,0 +1,115 @@
+import itertools
+import pytest
+from assets import codegen
+from assets.codegen import compile_function
+from assets.netlist import compile_circuit, flatten_netlist
+from assets.simulation import Simulator, BitParallelSimulator, get_truth_table
+from circuits import make_circuit, make_gate, xor_circuit, parity_circuit, sr_latch_circuit, constant_circuit
+
+COMBINATIONAL = {
+    'xor': (xor_circuit, lambda a, b: (a ^ b,)),
+    'parity': (parity_circuit, lambda a, b, c: (a ^ b ^ c,)),
+}
+
+# (S, R) inputs and the expected (Q, Qn) after each step
+LATCH_STEPS = [
+    ((1, 0), (1, 0)),
+    ((0, 0), (1, 0)),
+    ((0, 1), (0, 1)),
+    ((0, 0), (0, 1)),
+    ((1, 0), (1, 0)),
+]
+
+def get_vectors(input_amt: int):
+    return [list(vector) for vector in itertools.product((0, 1), repeat=input_amt)]
+
+@pytest.fixture(params=COMBINATIONAL)
+def combinational(request):
+    build, expected = COMBINATIONAL[request.param]
+    netlist = compile_circuit(build())
+    vectors = get_vectors(len(netlist.input_nets))
+    return netlist, vectors, [expected(*vector) for vector in vectors]
+
+def test_simulator_matches_expected(combinational):
+    netlist, vectors, expected = combinational
+    simulator = Simulator(netlist)
+    assert [tuple(simulator.evaluate(vector)) for vector in vectors] == expected
+
+def test_truth_table_matches_expected(combinational):
+    netlist, _, expected = combinational
+    assert get_truth_table(netlist) == expected
+
+def test_flattened_netlist_matches_expected(combinational):
+    netlist, _, expected = combinational
+    flat = flatten_netlist(netlist)
+    
+    assert all(record.kind != 'Custom' for record in flat.gates)
+    assert get_truth_table(flat) == expected
+
+def test_numpy_simulator_matches_expected(combinational):
+    pytest.importorskip('numpy')
+    from assets.numpy_simulation import NumpyBatchSimulator
+    
+    netlist, vectors, expected = combinational
+    assert [tuple(outputs) for outputs in NumpyBatchSimulator(netlist).evaluate(vectors).tolist()] == expected
+
+def test_generated_function_matches_expected(combinational):
+    netlist, vectors, expected = combinational
+    function = compile_function(netlist)
+    assert function is not None
+    assert [tuple(function(vector)) for vector in vectors] == expected
+
+def test_latch_is_not_generated_as_function():
+    assert compile_function(compile_circuit(sr_latch_circuit())) is None
+
+def test_generated_function_skips_custom_gates_without_outputs():
+    sink = make_circuit('Sink', 1, 0, [make_gate('Xor', xor_circuit(), 2, 1)], [[0, 1]])
+    # nodes: in 0, sink 1, not 2-3, out 4
+    netlist = compile_circuit(make_circuit('Outer', 1, 1, [make_gate('Sink', sink, 1, 0), make_gate('Not', '#functionNot', 1, 1)], [[0, 1, 2], [3, 4]]))
+    assert compile_function(netlist)([1]) == [0]
+
+def test_simulator_does_not_generate_child_functions():
+    netlist = compile_circuit(parity_circuit())
+    simulator = Simulator(netlist)
+    
+    assert not simulator.functions
+    assert all(record.netlist not in codegen._compiled_functions for record in netlist.gates)
+
+def test_simulator_uses_given_child_functions():
+    netlist = compile_circuit(xor_circuit())
+    simulator = Simulator(netlist, functions={4: lambda inputs: [1]})
+    
+    assert not simulator.children
+    assert simulator.evaluate([0, 0]) == [1]
+
+def test_circuit_without_inputs_has_one_row():
+    netlist = compile_circuit(constant_circuit())
+    
+    assert Simulator(netlist).evaluate([]) == [1]
+    assert get_truth_table(netlist) == [(1,)]
+
+def test_numpy_simulator_without_inputs_has_one_row():
+    pytest.importorskip('numpy')
+    from assets.numpy_simulation import NumpyBatchSimulator
+    
+    simulator = NumpyBatchSimulator(compile_circuit(constant_circuit()))
+    assert simulator.evaluate([]).tolist() == [[1]]
+    assert simulator.evaluate([[], []]).tolist() == [[1], [1]]
+
+@pytest.mark.parametrize('flatten', [False, True])
+def test_simulator_holds_latch_state(flatten):
+    netlist = compile_circuit(sr_latch_circuit())
+    if flatten:
+        netlist = flatten_netlist(netlist)
+    assert netlist.has_feedback
+    
+    simulator = Simulator(netlist)
+    assert [tuple(simulator.evaluate(list(inputs))) for inputs, _ in LATCH_STEPS] == [outputs for _, outputs in LATCH_STEPS]
+
+def test_bit_parallel_simulator_holds_latch_state_per_lane():
+    netlist = compile_circuit(sr_latch_circuit())
+    simulator = BitParallelSimulator(netlist, 2)
+    
+    # lane 1 runs the steps with S and R swapped, so it must mirror lane 0
+    for (s, r), (q, qn) in LATCH_STEPS:
+        assert simulator.evaluate([s | r << 1, r | s << 1]) == [q | qn << 1, qn | q << 1]
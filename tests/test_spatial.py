@@ -0,0 +1,24 @@
+import pygame
+from assets.spatial import SpatialGrid, get_segment_rect
+
+def test_query_finds_items_in_overlapping_cells():
+    grid = SpatialGrid(64)
+    grid.update('gate', [pygame.Rect(10, 10, 100, 20)])
+    grid.update('wire', [get_segment_rect((200, 200), (200, 400), 2)])
+    
+    assert grid.query_point((100, 20)) == {'gate'}
+    assert grid.query_point((200, 300)) == {'wire'}
+    assert grid.query_point((500, 500)) == set()
+    assert grid.query_rect(pygame.Rect(0, 0, 300, 300)) == {'gate', 'wire'}
+
+def test_moved_and_removed_items_leave_old_cells():
+    grid = SpatialGrid(64)
+    grid.update('gate', [pygame.Rect(10, 10, 20, 20)])
+    grid.update('gate', [pygame.Rect(300, 300, 20, 20)])
+    
+    assert grid.query_point((20, 20)) == set()
+    assert grid.query_point((310, 310)) == {'gate'}
+    
+    grid.remove('gate')
+    assert 'gate' not in grid
+    assert not grid.cells